@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+上传、列表和评测接口的负载基准：在固定随机种子生成的数据集上，通过 Flask test client
+分别以单线程和并发方式请求各接口，输出 p50/p95/p99 延迟和吞吐量，并与保存的基线对比
+
+数据集：数千名用户、数百个实验、10 万条提交和成绩，上传使用合成的 zip 压缩包，
+评测使用一个单独的实验，其中每个学生代码只读写 CSV，不依赖第三方库，测的是评测流水线本身的开销
+
+用法：
+    python benchmarks/load_test.py                       # 运行并与 benchmarks/baseline.json 对比，退化超过阈值时返回非零
+    python benchmarks/load_test.py --update-baseline     # 以本次结果覆盖基线
+    python benchmarks/load_test.py --output result.json  # 另存本次结果
+    BENCH_SUBMISSIONS=20000 BENCH_CONCURRENCY=4 python benchmarks/load_test.py
+
+基线与机器相关，更换机器或数据规模后需要重新生成；数据规模与基线不一致时不做对比
+所有文件写入临时目录，不会改动仓库中的 lab*/uploads/blobs 目录
+"""
+import argparse
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_FILE = os.path.join(os.path.dirname(BENCH_DIR), 'app(1).py')
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+
+# 数据规模
+STUDENTS = int(os.environ.get('BENCH_STUDENTS', 3000))
+TEACHERS = int(os.environ.get('BENCH_TEACHERS', 20))
+CLASSES = int(os.environ.get('BENCH_CLASSES', 60))
+EXPERIMENTS = int(os.environ.get('BENCH_EXPERIMENTS', 300))
+SUBMISSIONS = int(os.environ.get('BENCH_SUBMISSIONS', 100000))
+# 已有提交中有成绩的比例，其余为待评测
+GRADED_RATIO = 0.9
+# 合成压缩包：数量和大小
+ARCHIVES = 8
+ARCHIVE_KB = int(os.environ.get('BENCH_ARCHIVE_KB', 256))
+# 评测实验的提交数和样本数
+GRADING_SUBMISSIONS = int(os.environ.get('BENCH_GRADING_SUBMISSIONS', 20))
+GRADING_SAMPLES = 2000
+
+# 负载参数
+REQUESTS = int(os.environ.get('BENCH_REQUESTS', 200))
+WARMUP = int(os.environ.get('BENCH_WARMUP', 20))
+CONCURRENCY = int(os.environ.get('BENCH_CONCURRENCY', 8))
+GRADING_RUNS = int(os.environ.get('BENCH_GRADING_RUNS', 3))
+GRADING_TIMEOUT = 600
+# 相对基线允许的退化比例：延迟增加或吞吐下降超过该比例即判定为退化
+THRESHOLD = float(os.environ.get('BENCH_THRESHOLD', 0.25))
+# 参与对比的指标：(指标名, 越大越好)
+COMPARED_METRICS = [('p50', False), ('p95', False), ('throughput', True)]
+
+SEED = 0
+
+
+def load_app(workdir):
+    """在临时目录中加载应用：相对路径（lab*、uploads、blobs）都落在该目录下"""
+    os.chdir(workdir)
+    if 'DATABASE_URL' not in os.environ:
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(workdir, 'bench.db')
+    # 慢请求日志会淹没基准输出
+    os.environ.setdefault('SLOW_REQUEST_SECONDS', '0')
+    # 后台线程由请求按需启动，避免在准备数据期间领取任务
+    os.environ.setdefault('BACKGROUND_WORKERS', '0')
+    spec = importlib.util.spec_from_file_location('dlplatform_app', APP_FILE)
+    module = importlib.util.module_from_spec(spec)
+    # 评测进程池按模块名序列化任务函数，模块必须可通过 sys.modules 找到
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def configure_sqlite(m):
+    """
+    SQLite 代替 MySQL 时只允许一个写入者：开启 WAL 并设置忙等待，
+    避免并发上传与后台解压线程的写入直接报 database is locked
+    """
+    if m.db.engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(m.db.engine, 'connect')
+    def _sqlite_pragmas(connection, record):
+        cursor = connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA busy_timeout=30000')
+        cursor.close()
+
+    m.db.engine.dispose()
+
+
+def dataset_meta():
+    return {
+        'students': STUDENTS,
+        'teachers': TEACHERS,
+        'classes': CLASSES,
+        'experiments': EXPERIMENTS,
+        'submissions': SUBMISSIONS,
+        'archive_kb': ARCHIVE_KB,
+        'grading_submissions': GRADING_SUBMISSIONS,
+        'requests': REQUESTS,
+        'concurrency': CONCURRENCY,
+    }
+
+
+def student_code(rng):
+    """合成的学生代码：读取真实标签，按一定错误率写出预测结果"""
+    error_rate = round(rng.uniform(0.0, 0.5), 3)
+    return (
+        'import csv\n'
+        'import random\n\n'
+        f'rng = random.Random({rng.randint(0, 10 ** 6)})\n'
+        "with open('../../testdata/all_labels.csv', newline='') as f:\n"
+        '    labels = [row[0] for row in list(csv.reader(f))[1:]]\n'
+        "with open('all_preds.csv', 'w', newline='') as f:\n"
+        '    writer = csv.writer(f)\n'
+        "    writer.writerow(['label'])\n"
+        '    for label in labels:\n'
+        f"        writer.writerow([label if rng.random() >= {error_rate} else 'x'])\n"
+    )
+
+
+def build_archives(rng):
+    """生成若干内容不同的 zip 压缩包：学生代码加一个随机数据文件"""
+    archives = []
+    for i in range(ARCHIVES):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('model/model.py', student_code(rng))
+            archive.writestr('model/README.md', f'合成提交 {i}\n')
+            archive.writestr('model/weights.bin', rng.randbytes(ARCHIVE_KB * 1024))
+        archives.append(buffer.getvalue())
+    return archives
+
+
+def seed(m, workdir):
+    """写入基准数据集，返回 (学生ID列表, 普通实验ID列表, 评测实验ID)"""
+    db = m.db
+    db.drop_all()
+    db.create_all()
+    rng = random.Random(SEED)
+    now = datetime.utcnow()
+
+    teacher_ids = list(range(1, TEACHERS + 1))
+    student_ids = list(range(TEACHERS + 1, TEACHERS + STUDENTS + 1))
+    db.session.execute(m.User.__table__.insert(), [{
+        'user_id': t, 'username': f'teacher{t}', 'password': 'x', 'user_type': 'teacher',
+        'email': f't{t}@x', 'real_name': f'教师{t}'
+    } for t in teacher_ids])
+    db.session.execute(m.Class.__table__.insert(), [{
+        'class_id': c, 'class_name': f'班级{c}', 'teacher_id': teacher_ids[c % TEACHERS]
+    } for c in range(1, CLASSES + 1)])
+    db.session.execute(m.User.__table__.insert(), [{
+        'user_id': s, 'username': f'student{s}', 'password': 'x', 'user_type': 'student',
+        'email': f's{s}@x', 'real_name': f'学生{s}', 'class_id': s % CLASSES + 1
+    } for s in student_ids])
+
+    # 最后一个实验专用于评测
+    experiment_ids = list(range(1, EXPERIMENTS + 1))
+    grading_experiment_id = EXPERIMENTS + 1
+    db.session.execute(m.Experiment.__table__.insert(), [{
+        'experiment_id': e, 'experiment_name': f'实验{e}', 'class_id': e % CLASSES + 1,
+        'teacher_id': teacher_ids[e % TEACHERS], 'description': '', 'metric': 'accuracy',
+        'publish_time': now - timedelta(hours=e)
+    } for e in experiment_ids + [grading_experiment_id]])
+
+    # 每个 (实验, 学生) 至多一条提交
+    pairs = rng.sample(range(EXPERIMENTS * STUDENTS), min(SUBMISSIONS, EXPERIMENTS * STUDENTS))
+    submissions, grades = [], []
+    for submission_id, pair in enumerate(pairs, start=1):
+        experiment_id, student_id = pair // STUDENTS + 1, student_ids[pair % STUDENTS]
+        submissions.append({
+            'submission_id': submission_id, 'experiment_id': experiment_id, 'student_id': student_id,
+            'submit_time': now - timedelta(minutes=rng.randint(0, 100000)),
+            'file_name': 'model', 'file_path': f'lab{experiment_id}/testcode/model', 'status': 'ready'
+        })
+        if rng.random() < GRADED_RATIO:
+            grades.append({
+                'submission_id': submission_id, 'experiment_id': experiment_id, 'student_id': student_id,
+                'score': rng.randint(0, 100), 'graded_by': teacher_ids[experiment_id % TEACHERS],
+                'graded_at': now
+            })
+    for i in range(0, len(submissions), 5000):
+        db.session.execute(m.Submission.__table__.insert(), submissions[i:i + 5000])
+    for i in range(0, len(grades), 5000):
+        db.session.execute(m.Grade.__table__.insert(), grades[i:i + 5000])
+
+    # 评测实验：真实标签和每个学生已解压的代码，路径用绝对路径，与应用根目录无关
+    lab_folder = os.path.join(workdir, f'lab{grading_experiment_id}')
+    os.makedirs(os.path.join(lab_folder, 'testdata'), exist_ok=True)
+    with open(os.path.join(lab_folder, 'testdata', 'all_labels.csv'), 'w') as f:
+        f.write('label\n')
+        f.writelines(f'{rng.randint(0, 9)}\n' for _ in range(GRADING_SAMPLES))
+    grading_rows = []
+    for i, student_id in enumerate(student_ids[:GRADING_SUBMISSIONS]):
+        folder = os.path.join(lab_folder, 'testcode', f'student{student_id}')
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, 'model.py'), 'w') as f:
+            f.write(student_code(rng))
+        grading_rows.append({
+            'submission_id': len(submissions) + i + 1, 'experiment_id': grading_experiment_id,
+            'student_id': student_id, 'submit_time': now, 'file_name': 'model', 'file_path': folder,
+            'status': 'ready'
+        })
+    if grading_rows:
+        db.session.execute(m.Submission.__table__.insert(), grading_rows)
+    db.session.commit()
+    return student_ids, experiment_ids, grading_experiment_id
+
+
+def percentile(sorted_values, q):
+    """最近秩法百分位数"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, wall):
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'p50': round(percentile(latencies, 50) * 1000, 3),
+        'p95': round(percentile(latencies, 95) * 1000, 3),
+        'p99': round(percentile(latencies, 99) * 1000, 3),
+        'throughput': round(len(latencies) / wall, 2) if wall else 0.0,
+    }
+
+
+def run_load(m, make_request, requests, concurrency, seed_offset=0):
+    """
+    负载生成：concurrency 个线程各自持有一个 test client，共发出 requests 个请求
+    make_request(client, rng) 发出一个请求并返回响应；状态码非 2xx 计为错误
+    返回 (每个请求的耗时列表, 错误数, 总耗时)
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def worker(index):
+        client = m.app.test_client()
+        rng = random.Random(SEED + seed_offset + index)
+        local = []
+        while True:
+            with lock:
+                if next(counter, None) is None:
+                    break
+            start = time.perf_counter()
+            response = make_request(client, rng)
+            local.append(time.perf_counter() - start)
+            if response.status_code >= 300:
+                with lock:
+                    errors[0] += 1
+                    if errors[0] <= 3:
+                        print(f'    请求失败: {response.status_code} {response.get_data(as_text=True)[:200]}')
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    return latencies, errors[0], time.perf_counter() - start
+
+
+def request_scenarios(student_ids, experiment_ids, archives):
+    """各接口的请求构造：名称 -> make_request(client, rng)"""
+
+    def upload(client, rng):
+        return client.post('/api/experiments/upload', data={
+            'file': (io.BytesIO(rng.choice(archives)), 'model.zip'),
+            'experimentId': str(rng.choice(experiment_ids)),
+            'studentId': str(rng.choice(student_ids)),
+        }, content_type='multipart/form-data')
+
+    def evaluations(client, rng):
+        return client.get('/api/evaluations', query_string={
+            'experiment_id': rng.choice(experiment_ids),
+            'page': rng.randint(1, 5),
+            'limit': 10,
+        })
+
+    def student_experiments(client, rng):
+        return client.get('/api/student/experiments', query_string={
+            'page': rng.randint(1, 5),
+            'limit': 10,
+        }, headers={'User-ID': str(rng.choice(student_ids))})
+
+    return {
+        'api_experiment_upload': upload,
+        'get_evaluations': evaluations,
+        'get_student_experiments': student_experiments,
+    }
+
+
+def wait_idle(m, timeout=GRADING_TIMEOUT):
+    """等待后台解压队列清空，避免上一个场景的解压影响下一个场景"""
+    deadline = time.time() + timeout
+    with m.app.app_context():
+        while time.time() < deadline:
+            pending = m.Submission.query.filter(m.Submission.status.in_(['received', 'extracting'])).count()
+            m.db.session.remove()
+            if not pending:
+                return
+            time.sleep(0.2)
+    print('    等待后台解压超时')
+
+
+def bench_requests(m, scenarios):
+    results = {}
+    for index, (name, make_request) in enumerate(scenarios.items()):
+        run_load(m, make_request, WARMUP, 1, seed_offset=1000 * index + 999)
+        wait_idle(m)
+        for concurrency in sorted({1, CONCURRENCY}):
+            latencies, errors, wall = run_load(m, make_request, REQUESTS, concurrency,
+                                               seed_offset=1000 * index + concurrency)
+            wait_idle(m)
+            key = f'{name}@{concurrency}'
+            results[key] = summarize(latencies, errors, wall)
+            print_result(key, results[key])
+    return results
+
+
+def bench_grading(m, grading_experiment_id):
+    """
+    评测：每轮清空评测缓存后请求 /api/test 创建全量评测任务，轮询任务直至完成
+    test_models 记录创建任务的请求延迟；test_models_job 记录任务从创建到完成的耗时，吞吐量为每秒评测的提交数
+    """
+    client = m.app.test_client()
+    request_latencies, job_latencies = [], []
+    errors = 0
+    graded = 0
+    total_wall = 0.0
+    for _ in range(GRADING_RUNS):
+        with m.app.app_context():
+            m.GradingCache.query.delete()
+            m.db.session.commit()
+            m.db.session.remove()
+        start = time.perf_counter()
+        response = client.get('/api/test', query_string={'experimentId': grading_experiment_id, 'mode': 'full'})
+        request_latencies.append(time.perf_counter() - start)
+        job_id = (response.get_json() or {}).get('data', {}).get('job_id') if response.status_code == 200 else None
+        if job_id is None:
+            errors += 1
+            print(f'    创建评测任务失败: {response.status_code} {response.get_data(as_text=True)[:200]}')
+            continue
+        deadline = start + GRADING_TIMEOUT
+        data = {}
+        while time.perf_counter() < deadline:
+            data = client.get(f'/api/test/jobs/{job_id}').get_json().get('data', {})
+            if data.get('status') in ('done', 'failed'):
+                break
+            time.sleep(0.05)
+        elapsed = time.perf_counter() - start
+        if data.get('status') != 'done':
+            errors += 1
+            print(f"    评测任务 {job_id} 未完成: {data.get('status')}")
+            continue
+        # 沙箱未运行（进程异常退出等）时条目没有分阶段耗时，同样计为失败
+        failed = [item for item in data.get('results', []) if item['status'] != 'success' or not item['timings']]
+        if failed:
+            errors += 1
+            print(f"    评测任务 {job_id} 有 {len(failed)} 个提交评测失败: {failed[0]['message'][:200]}")
+        job_latencies.append(elapsed)
+        graded += len(data.get('results', [])) - len(failed)
+        total_wall += elapsed
+
+    results = {
+        'test_models': summarize(request_latencies, errors, sum(request_latencies)),
+        'test_models_job': summarize(job_latencies, errors, total_wall),
+    }
+    # 评测任务的吞吐量按提交数计
+    results['test_models_job']['throughput'] = round(graded / total_wall, 2) if total_wall else 0.0
+    for key, result in results.items():
+        print_result(key, result)
+    return results
+
+
+def print_result(key, result):
+    print(f"{key:<32} p50={result['p50']:>9.2f}ms p95={result['p95']:>9.2f}ms p99={result['p99']:>9.2f}ms "
+          f"吞吐={result['throughput']:>8.2f}/s 请求={result['requests']} 错误={result['errors']}")
+
+
+def compare(results, baseline):
+    """与基线对比，返回退化项列表"""
+    regressions = []
+    print(f'\n===== 与基线对比（阈值 {THRESHOLD:.0%}） =====')
+    for key, base in baseline.get('results', {}).items():
+        current = results.get(key)
+        if current is None:
+            print(f'{key}: 本次未运行')
+            continue
+        for metric, higher_is_better in COMPARED_METRICS:
+            old, new = base.get(metric), current.get(metric)
+            if not old:
+                continue
+            change = new / old - 1
+            regressed = change < -THRESHOLD if higher_is_better else change > THRESHOLD
+            flag = '  <-- 退化' if regressed else ''
+            print(f'{key:<32} {metric:<10} {old:>10.2f} -> {new:>10.2f} ({change:+.1%}){flag}')
+            if regressed:
+                regressions.append(f'{key} {metric}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='上传、列表和评测接口的负载基准')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='基线文件路径')
+    parser.add_argument('--update-baseline', action='store_true', help='以本次结果覆盖基线')
+    parser.add_argument('--output', help='本次结果另存为 JSON')
+    args = parser.parse_args()
+    baseline_path = os.path.abspath(args.baseline)
+    output_path = os.path.abspath(args.output) if args.output else None
+
+    workdir = tempfile.mkdtemp(prefix='dlplatform-bench-')
+    m = load_app(workdir)
+    rng = random.Random(SEED)
+    with m.app.app_context():
+        database = m.db.engine.dialect.name
+        configure_sqlite(m)
+        print(f'数据库: {m.db.engine.url.render_as_string(hide_password=True)}')
+        print(f'工作目录: {workdir}')
+        print(f'写入 {STUDENTS} 名学生、{EXPERIMENTS} 个实验、{SUBMISSIONS} 条提交...')
+        start = time.perf_counter()
+        student_ids, experiment_ids, grading_experiment_id = seed(m, workdir)
+        print(f'数据准备耗时 {time.perf_counter() - start:.1f}s')
+    archives = build_archives(rng)
+
+    print(f'\n===== 接口负载（每项 {REQUESTS} 个请求，并发 1 / {CONCURRENCY}） =====')
+    results = bench_requests(m, request_scenarios(student_ids, experiment_ids, archives))
+    results.update(bench_grading(m, grading_experiment_id))
+
+    report = {
+        'meta': dataset_meta(),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'database': database,
+            'recorded_at': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+        },
+        'results': results,
+    }
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    errors = sum(result['errors'] for result in results.values())
+    if args.update_baseline:
+        if errors:
+            print(f'\n本次运行有 {errors} 个错误，不更新基线')
+            return 1
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write('\n')
+        print(f'\n基线已写入 {baseline_path}')
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f'\n基线文件不存在: {baseline_path}，使用 --update-baseline 生成')
+        return 1 if errors else 0
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('meta') != report['meta']:
+        print(f"\n数据规模与基线不一致，不做对比：基线 {baseline.get('meta')}，本次 {report['meta']}")
+        return 1 if errors else 0
+
+    regressions = compare(results, baseline)
+    if errors:
+        print(f'\n本次运行有 {errors} 个错误')
+    if regressions:
+        print(f"\n性能退化: {', '.join(regressions)}")
+    return 1 if errors or regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
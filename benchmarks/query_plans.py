@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+热点查询的执行计划对比：在 10 万条提交记录的数据集上，分别输出建索引前后的执行计划和耗时
+
+用法：
+    python benchmarks/query_plans.py                       # 默认使用临时 SQLite 数据库
+    DATABASE_URL=mysql+pymysql://... python benchmarks/query_plans.py   # 使用独立的空 MySQL 库
+"""
+import importlib.util
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+APP_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app(1).py')
+
+SUBMISSIONS = int(os.environ.get('BENCH_SUBMISSIONS', 100000))
+EXPERIMENTS = 200
+STUDENTS = 500
+CLASSES = 20
+REPEAT = 200
+
+# 本次迁移新增的索引
+BENCH_INDEXES = {
+    'users': ['ix_users_class_id'],
+    'experiments': ['ix_experiments_publish_time'],
+    'submissions': ['uq_submissions_experiment_student', 'ix_submissions_experiment_submit_time'],
+}
+
+# 热点查询：名称 -> (SQL, 参数)
+QUERIES = {
+    '上传：按实验和学生查提交': (
+        'SELECT submission_id FROM submissions WHERE experiment_id = :eid AND student_id = :sid', {'eid': 17, 'sid': 123}),
+    '评测列表：按实验取最新提交': (
+        'SELECT submission_id, submit_time FROM submissions WHERE experiment_id = :eid '
+        'ORDER BY submit_time DESC LIMIT 20', {'eid': 17}),
+    '成绩：按提交查成绩': (
+        'SELECT score FROM grades WHERE submission_id = :sub', {'sub': 4242}),
+    '实验列表：按发布时间分页': (
+        'SELECT experiment_id FROM experiments ORDER BY publish_time DESC, experiment_id DESC LIMIT 10', {}),
+    '班级学生：按班级查用户': (
+        'SELECT user_id FROM users WHERE class_id = :cid', {'cid': 3}),
+}
+
+
+def load_app():
+    if 'DATABASE_URL' not in os.environ:
+        os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'bench.db')
+    # 后台线程由请求按需启动，避免在准备数据期间领取任务
+    os.environ.setdefault('BACKGROUND_WORKERS', '0')
+    spec = importlib.util.spec_from_file_location('dlplatform_app', APP_FILE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def seed(m):
+    db = m.db
+    db.drop_all()
+    db.create_all()
+    rng = random.Random(0)
+    now = datetime.utcnow()
+
+    users = [{'user_id': 1, 'username': 'teacher', 'password': 'x', 'user_type': 'teacher', 'email': 't@x'}]
+    classes = [{'class_id': c, 'class_name': f'班级{c}', 'teacher_id': 1} for c in range(1, CLASSES + 1)]
+    db.session.execute(m.User.__table__.insert(), users)
+    db.session.execute(m.Class.__table__.insert(), classes)
+    db.session.execute(m.User.__table__.insert(), [{
+        'user_id': s + 1, 'username': f'student{s}', 'password': 'x', 'user_type': 'student',
+        'email': f's{s}@x', 'class_id': s % CLASSES + 1
+    } for s in range(1, STUDENTS + 1)])
+    db.session.execute(m.Experiment.__table__.insert(), [{
+        'experiment_id': e, 'experiment_name': f'实验{e}', 'class_id': e % CLASSES + 1, 'teacher_id': 1,
+        'description': '', 'publish_time': now - timedelta(days=e)
+    } for e in range(1, EXPERIMENTS + 1)])
+
+    # 每个 (实验, 学生) 至多一条提交
+    pairs = rng.sample(range(EXPERIMENTS * STUDENTS), SUBMISSIONS)
+    submissions, grades = [], []
+    for submission_id, pair in enumerate(pairs, start=1):
+        experiment_id, student_id = pair // STUDENTS + 1, pair % STUDENTS + 2
+        submissions.append({
+            'submission_id': submission_id, 'experiment_id': experiment_id, 'student_id': student_id,
+            'submit_time': now - timedelta(minutes=rng.randint(0, 100000)),
+            'file_name': 'model', 'file_path': f'lab{experiment_id}/testcode/model', 'status': 'ready'
+        })
+        grades.append({
+            'submission_id': submission_id, 'experiment_id': experiment_id, 'student_id': student_id,
+            'score': rng.randint(0, 100), 'graded_by': 1, 'graded_at': now
+        })
+    for i in range(0, SUBMISSIONS, 5000):
+        db.session.execute(m.Submission.__table__.insert(), submissions[i:i + 5000])
+        db.session.execute(m.Grade.__table__.insert(), grades[i:i + 5000])
+    db.session.commit()
+
+
+def explain(m, sql, params):
+    text = m.db.text
+    if m.db.engine.dialect.name == 'sqlite':
+        rows = m.db.session.execute(text('EXPLAIN QUERY PLAN ' + sql), params).fetchall()
+        return [row[-1] for row in rows]
+    rows = m.db.session.execute(text('EXPLAIN ' + sql), params).mappings().fetchall()
+    return [f"{row['table']}: type={row['type']} key={row['key']} rows={row['rows']} {row['Extra'] or ''}"
+            for row in rows]
+
+
+def timing(m, sql, params):
+    statement = m.db.text(sql)
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        m.db.session.execute(statement, params).fetchall()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def report(m, title):
+    print(f'\n===== {title} =====')
+    results = {}
+    for name, (sql, params) in QUERIES.items():
+        plan = explain(m, sql, params)
+        results[name] = timing(m, sql, params)
+        print(f'\n[{name}] {results[name]:.3f} ms/次')
+        for line in plan:
+            print(f'    {line}')
+    return results
+
+
+def set_indexes(m, create):
+    for model in (m.User, m.Experiment, m.Submission):
+        table = model.__table__
+        for index in table.indexes:
+            if index.name in BENCH_INDEXES[table.name]:
+                if create:
+                    index.create(m.db.engine)
+                else:
+                    index.drop(m.db.engine)
+
+
+def main():
+    m = load_app()
+    with m.app.app_context():
+        print(f'数据库: {m.db.engine.url.render_as_string(hide_password=True)}')
+        print(f'写入 {SUBMISSIONS} 条提交记录...')
+        seed(m)
+        set_indexes(m, create=False)
+        before = report(m, '建索引前')
+        set_indexes(m, create=True)
+        m.db.session.execute(m.db.text('ANALYZE'))
+        after = report(m, '建索引后')
+        print('\n===== 汇总 =====')
+        for name in QUERIES:
+            print(f'{name}: {before[name]:.3f} ms -> {after[name]:.3f} ms')
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""初始表结构
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('user_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False),
+        sa.Column('password', sa.String(length=50), nullable=False),
+        sa.Column('user_type', sa.Enum('student', 'teacher', name='usertype'), nullable=False),
+        sa.Column('real_name', sa.String(length=50), nullable=True),
+        sa.Column('student_id', sa.String(length=20), nullable=True),
+        sa.Column('profile_completed', sa.Boolean(), nullable=True),
+        sa.Column('class_id', sa.Integer(), nullable=True),
+        sa.Column('email', sa.String(length=100), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+        sa.PrimaryKeyConstraint('user_id'),
+        sa.UniqueConstraint('username')
+    )
+    op.create_table(
+        'classes',
+        sa.Column('class_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('class_name', sa.String(length=100), nullable=False),
+        sa.Column('teacher_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['teacher_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('class_id')
+    )
+    # users 与 classes 互相引用，外键在两张表都建好后再添加
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.create_foreign_key('fk_users_class_id', 'classes', ['class_id'], ['class_id'])
+    op.create_table(
+        'student_classes',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('class_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['class_id'], ['classes.class_id']),
+        sa.ForeignKeyConstraint(['student_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'experiments',
+        sa.Column('experiment_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('experiment_name', sa.String(length=100), nullable=False),
+        sa.Column('class_id', sa.Integer(), nullable=False),
+        sa.Column('teacher_id', sa.Integer(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('publish_time', sa.TIMESTAMP(), nullable=True),
+        sa.Column('deadline', sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(['class_id'], ['classes.class_id']),
+        sa.ForeignKeyConstraint(['teacher_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('experiment_id')
+    )
+    op.create_table(
+        'experiment_attachments',
+        sa.Column('attachment_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('experiment_id', sa.Integer(), nullable=False),
+        sa.Column('file_name', sa.String(length=255), nullable=False),
+        sa.Column('file_path', sa.String(length=255), nullable=False),
+        sa.Column('file_size', sa.Integer(), nullable=False),
+        sa.Column('upload_time', sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(['experiment_id'], ['experiments.experiment_id']),
+        sa.PrimaryKeyConstraint('attachment_id')
+    )
+    op.create_table(
+        'submissions',
+        sa.Column('submission_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('experiment_id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('submit_time', sa.TIMESTAMP(), nullable=True),
+        sa.Column('file_name', sa.String(length=255), nullable=False),
+        sa.Column('file_path', sa.String(length=255), nullable=False),
+        sa.ForeignKeyConstraint(['experiment_id'], ['experiments.experiment_id']),
+        sa.ForeignKeyConstraint(['student_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('submission_id')
+    )
+    op.create_table(
+        'grades',
+        sa.Column('grade_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('submission_id', sa.Integer(), nullable=False),
+        sa.Column('experiment_id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Numeric(precision=5, scale=2), nullable=False),
+        sa.Column('graded_by', sa.Integer(), nullable=False),
+        sa.Column('graded_at', sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(['experiment_id'], ['experiments.experiment_id']),
+        sa.ForeignKeyConstraint(['graded_by'], ['users.user_id']),
+        sa.ForeignKeyConstraint(['student_id'], ['users.user_id']),
+        sa.ForeignKeyConstraint(['submission_id'], ['submissions.submission_id']),
+        sa.PrimaryKeyConstraint('grade_id'),
+        sa.UniqueConstraint('submission_id')
+    )
+
+
+def downgrade():
+    op.drop_table('grades')
+    op.drop_table('submissions')
+    op.drop_table('experiment_attachments')
+    op.drop_table('experiments')
+    op.drop_table('student_classes')
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_constraint('fk_users_class_id', type_='foreignkey')
+    op.drop_table('classes')
+    op.drop_table('users')
@@ -0,0 +1,103 @@
+"""评测任务、评测缓存、分块上传与解压状态
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:05:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('experiments', sa.Column('metric', sa.String(length=20), nullable=False,
+                                           server_default='accuracy'))
+
+    op.add_column('submissions', sa.Column('status', sa.String(length=20), nullable=False, server_default='ready'))
+    op.add_column('submissions', sa.Column('status_message', sa.String(length=255), nullable=True))
+    op.add_column('submissions', sa.Column('archive_path', sa.String(length=255), nullable=True))
+
+    op.add_column('grades', sa.Column('exit_reason', sa.String(length=20), nullable=True))
+    op.add_column('grades', sa.Column('peak_rss_kb', sa.Integer(), nullable=True))
+    op.add_column('grades', sa.Column('cpu_time', sa.Float(), nullable=True))
+    op.add_column('grades', sa.Column('runtime', sa.Float(), nullable=True))
+
+    op.create_table(
+        'grading_jobs',
+        sa.Column('job_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('experiment_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('mode', sa.String(length=20), nullable=False),
+        sa.Column('total_count', sa.Integer(), nullable=False),
+        sa.Column('skipped_count', sa.Integer(), nullable=False),
+        sa.Column('message', sa.String(length=255), nullable=True),
+        sa.Column('download_url', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('started_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('finished_at', sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(['experiment_id'], ['experiments.experiment_id']),
+        sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_table(
+        'grading_job_items',
+        sa.Column('item_id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('submission_id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('score', sa.Numeric(precision=5, scale=2), nullable=True),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['grading_jobs.job_id']),
+        sa.ForeignKeyConstraint(['student_id'], ['users.user_id']),
+        sa.ForeignKeyConstraint(['submission_id'], ['submissions.submission_id']),
+        sa.PrimaryKeyConstraint('item_id')
+    )
+    op.create_table(
+        'grading_cache',
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('score', sa.Numeric(precision=5, scale=2), nullable=False),
+        sa.Column('message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+        sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_table(
+        'upload_sessions',
+        sa.Column('upload_id', sa.String(length=32), nullable=False),
+        sa.Column('experiment_id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('file_name', sa.String(length=255), nullable=False),
+        sa.Column('file_path', sa.String(length=255), nullable=False),
+        sa.Column('total_size', sa.BigInteger(), nullable=False),
+        sa.Column('received_size', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(['experiment_id'], ['experiments.experiment_id']),
+        sa.ForeignKeyConstraint(['student_id'], ['users.user_id']),
+        sa.PrimaryKeyConstraint('upload_id')
+    )
+
+
+def downgrade():
+    op.drop_table('upload_sessions')
+    op.drop_table('grading_cache')
+    op.drop_table('grading_job_items')
+    op.drop_table('grading_jobs')
+    with op.batch_alter_table('grades') as batch_op:
+        batch_op.drop_column('runtime')
+        batch_op.drop_column('cpu_time')
+        batch_op.drop_column('peak_rss_kb')
+        batch_op.drop_column('exit_reason')
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.drop_column('archive_path')
+        batch_op.drop_column('status_message')
+        batch_op.drop_column('status')
+    with op.batch_alter_table('experiments') as batch_op:
+        batch_op.drop_column('metric')
@@ -0,0 +1,53 @@
+"""热点查询索引，以及每个学生每个实验唯一的提交记录
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:10:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def _remove_duplicate_submissions():
+    """旧的先查后插逻辑在并发上传时可能留下重复提交，只保留每个学生每个实验最新的一条"""
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        'SELECT submission_id, experiment_id, student_id FROM submissions '
+        'ORDER BY experiment_id, student_id, submission_id DESC'
+    )).fetchall()
+    seen = set()
+    duplicates = []
+    for submission_id, experiment_id, student_id in rows:
+        if (experiment_id, student_id) in seen:
+            duplicates.append(submission_id)
+        else:
+            seen.add((experiment_id, student_id))
+    for i in range(0, len(duplicates), 500):
+        params = {'ids': duplicates[i:i + 500]}
+        for table in ('grading_job_items', 'grades', 'submissions'):
+            bind.execute(sa.text(f'DELETE FROM {table} WHERE submission_id IN :ids')
+                         .bindparams(sa.bindparam('ids', expanding=True)), params)
+
+
+def upgrade():
+    _remove_duplicate_submissions()
+    op.create_index('uq_submissions_experiment_student', 'submissions', ['experiment_id', 'student_id'],
+                    unique=True)
+    op.create_index('ix_submissions_experiment_submit_time', 'submissions', ['experiment_id', 'submit_time'])
+    op.create_index('ix_experiments_publish_time', 'experiments', ['publish_time', 'experiment_id'])
+    op.create_index('ix_users_class_id', 'users', ['class_id'])
+
+
+def downgrade():
+    op.drop_index('ix_users_class_id', table_name='users')
+    op.drop_index('ix_experiments_publish_time', table_name='experiments')
+    op.drop_index('ix_submissions_experiment_submit_time', table_name='submissions')
+    op.drop_index('uq_submissions_experiment_student', table_name='submissions')
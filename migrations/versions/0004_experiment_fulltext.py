@@ -0,0 +1,26 @@
+"""实验名称和描述的全文索引
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ngram 分词器按字切分，中文和英文关键词都能命中
+    op.create_index('ft_experiments_name_description', 'experiments', ['experiment_name', 'description'],
+                    mysql_prefix='FULLTEXT', mysql_with_parser='ngram')
+
+
+def downgrade():
+    op.drop_index('ft_experiments_name_description', table_name='experiments')
@@ -0,0 +1,41 @@
+"""实验和班级的最后修改时间，用于列表接口的 ETag / Last-Modified
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 11:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def _updated_at_column():
+    # MySQL 由数据库在任何更新时刷新（包括其他服务对表的修改）；其他数据库只设置默认值
+    if op.get_bind().dialect.name == 'mysql':
+        default = sa.text('CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP')
+    else:
+        default = sa.text('CURRENT_TIMESTAMP')
+    return sa.Column('updated_at', sa.TIMESTAMP(), nullable=True, server_default=default)
+
+
+def upgrade():
+    op.add_column('experiments', _updated_at_column())
+    op.add_column('classes', _updated_at_column())
+    op.create_index('ix_experiments_teacher_updated_at', 'experiments', ['teacher_id', 'updated_at'])
+    op.create_index('ix_classes_teacher_updated_at', 'classes', ['teacher_id', 'updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_classes_teacher_updated_at', table_name='classes')
+    op.drop_index('ix_experiments_teacher_updated_at', table_name='experiments')
+    with op.batch_alter_table('classes') as batch_op:
+        batch_op.drop_column('updated_at')
+    with op.batch_alter_table('experiments') as batch_op:
+        batch_op.drop_column('updated_at')
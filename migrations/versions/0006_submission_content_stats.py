@@ -0,0 +1,30 @@
+"""提交内容的总字节数、文件数和内容摘要
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 已有提交升级后执行 flask --app "app(1)" backfill-submission-stats 补算
+    op.add_column('submissions', sa.Column('total_bytes', sa.BigInteger(), nullable=True))
+    op.add_column('submissions', sa.Column('file_count', sa.Integer(), nullable=True))
+    op.add_column('submissions', sa.Column('content_digest', sa.String(length=64), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.drop_column('content_digest')
+        batch_op.drop_column('file_count')
+        batch_op.drop_column('total_bytes')
@@ -0,0 +1,47 @@
+"""内容寻址存储：存储内容的引用计数及提交引用的文件
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 12:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 已有提交升级后执行 flask --app "app(1)" backfill-submission-stats 移入存储
+    op.create_table(
+        'blobs',
+        sa.Column('digest', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('crc32', sa.BigInteger(), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+        sa.PrimaryKeyConstraint('digest')
+    )
+    op.create_index('ix_blobs_size_crc32', 'blobs', ['size', 'crc32'])
+    op.create_table(
+        'submission_files',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('submission_id', sa.Integer(), nullable=False),
+        sa.Column('path', sa.String(length=512), nullable=False),
+        sa.Column('digest', sa.String(length=64), nullable=False),
+        sa.ForeignKeyConstraint(['submission_id'], ['submissions.submission_id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_submission_files_submission_id', 'submission_files', ['submission_id'])
+
+
+def downgrade():
+    op.drop_index('ix_submission_files_submission_id', table_name='submission_files')
+    op.drop_table('submission_files')
+    op.drop_index('ix_blobs_size_crc32', table_name='blobs')
+    op.drop_table('blobs')
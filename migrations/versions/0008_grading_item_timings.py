@@ -0,0 +1,25 @@
+"""评测任务条目记录沙箱各阶段耗时
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('grading_job_items', sa.Column('timings', sa.Text(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('grading_job_items') as batch_op:
+        batch_op.drop_column('timings')
@@ -0,0 +1,52 @@
+"""代码查重：每个提交的 MinHash 签名及 LSH 分段索引
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 已有提交的签名在首次查重时计算
+    op.create_table(
+        'code_signatures',
+        sa.Column('submission_id', sa.Integer(), nullable=False),
+        sa.Column('experiment_id', sa.Integer(), nullable=False),
+        sa.Column('content_digest', sa.String(length=64), nullable=True),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('token_count', sa.Integer(), nullable=False),
+        sa.Column('minhash', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+        sa.ForeignKeyConstraint(['experiment_id'], ['experiments.experiment_id']),
+        sa.ForeignKeyConstraint(['submission_id'], ['submissions.submission_id']),
+        sa.PrimaryKeyConstraint('submission_id')
+    )
+    op.create_index('ix_code_signatures_experiment_id', 'code_signatures', ['experiment_id'])
+    op.create_table(
+        'code_lsh_buckets',
+        sa.Column('submission_id', sa.Integer(), nullable=False),
+        sa.Column('band', sa.SmallInteger(), autoincrement=False, nullable=False),
+        sa.Column('experiment_id', sa.Integer(), nullable=False),
+        sa.Column('bucket', sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(['experiment_id'], ['experiments.experiment_id']),
+        sa.ForeignKeyConstraint(['submission_id'], ['submissions.submission_id']),
+        sa.PrimaryKeyConstraint('submission_id', 'band')
+    )
+    op.create_index('ix_code_lsh_buckets_lookup', 'code_lsh_buckets', ['experiment_id', 'band', 'bucket'])
+
+
+def downgrade():
+    op.drop_index('ix_code_lsh_buckets_lookup', table_name='code_lsh_buckets')
+    op.drop_table('code_lsh_buckets')
+    op.drop_index('ix_code_signatures_experiment_id', table_name='code_signatures')
+    op.drop_table('code_signatures')
@@ -0,0 +1,24 @@
+"""实验排行按实验读取并按分数排序成绩
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_grades_experiment_score', 'grades', ['experiment_id', 'score'])
+
+
+def downgrade():
+    op.drop_index('ix_grades_experiment_score', table_name='grades')
@@ -0,0 +1,25 @@
+"""评测任务记录执行进程的心跳，用于回收进程崩溃后遗留的任务
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011'
+down_revision = '0010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('grading_jobs', sa.Column('heartbeat_at', sa.TIMESTAMP(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('grading_jobs') as batch_op:
+        batch_op.drop_column('heartbeat_at')
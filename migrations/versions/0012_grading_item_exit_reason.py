@@ -0,0 +1,25 @@
+"""评测任务条目记录沙箱退出原因
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('grading_job_items', sa.Column('exit_reason', sa.String(length=20), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('grading_job_items') as batch_op:
+        batch_op.drop_column('exit_reason')
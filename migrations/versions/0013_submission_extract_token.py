@@ -0,0 +1,27 @@
+"""提交记录增加解压令牌和解压心跳
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 20:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('submissions', sa.Column('extract_token', sa.String(length=32), nullable=True))
+    op.add_column('submissions', sa.Column('extract_heartbeat_at', sa.TIMESTAMP(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('submissions') as batch_op:
+        batch_op.drop_column('extract_heartbeat_at')
+        batch_op.drop_column('extract_token')
@@ -0,0 +1,29 @@
+"""实验、班级列表的版本号，用于列表接口的 ETag
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18 22:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0014'
+down_revision = '0013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'list_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('list_versions')
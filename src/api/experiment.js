@@ -291,8 +291,8 @@ export function getResultList(params) {
   })
 }
 
-// 一键评测所有提交
-export function evaluateAll(experimentId) {
+// 一键评测所有提交（mode: full 全部重新评测，incremental 只评测新的提交）
+export function evaluateAll(experimentId, mode = 'full') {
   if (!experimentId) {
     console.error('evaluateAll: 缺少experimentId参数')
     return Promise.reject(new Error('缺少实验ID参数'))
@@ -310,8 +310,7 @@ export function evaluateAll(experimentId) {
   return request({
     url: '/test',
     method: 'get',
-    params: { experimentId: numericExperimentId },
-    timeout: 60000 // 增加超时时间到60秒，因为评测可能需要较长时间
+    params: { experimentId: numericExperimentId, mode }
   }).then(response => {
     console.log('一键评测响应:', response)
     return response
@@ -321,6 +320,14 @@ export function evaluateAll(experimentId) {
   })
 }
 
+// 查询评测任务进度
+export function getGradingJob(jobId) {
+  return request({
+    url: `/test/jobs/${jobId}`,
+    method: 'get'
+  })
+}
+
 // 一键查重
 export function checkPlagiarism(experimentId) {
   if (!experimentId) {
@@ -7,6 +7,47 @@ export function uploadExperimentFile(formData) {
   })
 }
 
+// 分块上传实验压缩包，连接中断后从服务器已接收的偏移量续传
+export async function uploadExperimentFileChunked(file, experimentId, studentId, onProgress) {
+  const initRes = await request.post('/api/experiments/upload/init', {
+    experimentId,
+    studentId,
+    fileName: file.name,
+    fileSize: file.size
+  })
+  if (initRes.code !== 200) {
+    return initRes
+  }
+
+  const { upload_id: uploadId, chunk_size: chunkSize } = initRes.data
+  let offset = initRes.data.offset
+  let retries = 0
+  while (offset < file.size) {
+    try {
+      const res = await request.put(`/api/experiments/upload/${uploadId}`, file.slice(offset, offset + chunkSize), {
+        params: { offset },
+        headers: { 'Content-Type': 'application/octet-stream' },
+        timeout: 0
+      })
+      offset = res.data.offset
+      retries = 0
+      if (onProgress) {
+        onProgress(Math.round(offset / file.size * 100))
+      }
+    } catch (error) {
+      if (retries >= 3) {
+        throw error
+      }
+      retries++
+      console.warn(`上传分块失败，正在重试(${retries}/3):`, error.message)
+      const status = await request.get(`/api/experiments/upload/${uploadId}`)
+      offset = status.data.offset
+    }
+  }
+
+  return request.post(`/api/experiments/upload/${uploadId}/complete`, {}, { timeout: 0 })
+}
+
 // 获取实验上传历史
 export function getUploadHistory(experimentId) {
   // 确保experimentId是数字
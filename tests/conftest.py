@@ -0,0 +1,80 @@
+"""
+后端测试：以 importlib 加载 app(1).py（文件名不是合法的模块名），使用临时 SQLite 数据库，不启动后台线程
+运行：python -m pytest -q
+"""
+import importlib.util
+import os
+import sys
+import zipfile
+
+import pytest
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app(1).py')
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    database = tmp_path_factory.mktemp('db') / 'test.db'
+    os.environ['DATABASE_URL'] = f'sqlite:///{database}'
+    os.environ['BACKGROUND_WORKERS'] = '0'
+    spec = importlib.util.spec_from_file_location('dlplatform_app', APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    # 评测进程池按模块名查找 _grading_worker
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def m(app_module, tmp_path, monkeypatch):
+    """每个测试使用空数据库、空的进程内缓存和独立的工作目录（提交、存储等路径均相对于当前目录）"""
+    monkeypatch.chdir(tmp_path)
+    # 上传接口会唤醒后台解压线程，测试中直接调用 _claim_extraction / extract_submission
+    monkeypatch.setattr(app_module, 'start_extraction_worker', lambda: None)
+    monkeypatch.setattr(app_module.response_cache, 'backend', app_module.LRUCacheBackend(1024, 60))
+    with app_module.app.app_context():
+        # users 与 classes 互相引用，drop_all 无法排序；直接换一个空的数据库文件
+        app_module.db.engine.dispose()
+        database = app_module.db.engine.url.database
+        if os.path.exists(database):
+            os.remove(database)
+        app_module.db.create_all()
+        app_module.leaderboards._boards.clear()
+        app_module.dashboard_stats.mark_stale()
+        yield app_module
+        app_module.db.session.remove()
+
+
+@pytest.fixture
+def seed(m):
+    """创建教师、班级、若干学生和一个实验，返回 (教师ID, [学生ID], 实验ID)"""
+
+    def create(student_count=1, metric='accuracy'):
+        teacher = m.User(username='teacher', password='x', user_type=m.UserType.TEACHER, email='t@example.com')
+        m.db.session.add(teacher)
+        m.db.session.flush()
+        klass = m.Class(class_name='一班', teacher_id=teacher.user_id)
+        m.db.session.add(klass)
+        m.db.session.flush()
+        students = []
+        for i in range(student_count):
+            student = m.User(username=f'student{i}', password='x', user_type=m.UserType.STUDENT,
+                             email=f's{i}@example.com', class_id=klass.class_id, real_name=f'学生{i}')
+            m.db.session.add(student)
+            m.db.session.flush()
+            students.append(student.user_id)
+        experiment = m.Experiment(experiment_name='实验', class_id=klass.class_id, teacher_id=teacher.user_id,
+                                  description='', metric=metric)
+        m.db.session.add(experiment)
+        m.db.session.commit()
+        return teacher.user_id, students, experiment.experiment_id
+
+    return create
+
+
+def make_zip(path, entries):
+    """entries: {条目名: 内容}；内容为 bytes 或 str"""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in entries.items():
+            archive.writestr(name, content)
+    return str(path)
@@ -0,0 +1,40 @@
+"""批量写入的 upsert：重复写入同一唯一键只保留一条记录"""
+from datetime import datetime
+
+
+def test_submission_upsert_is_idempotent(m, seed):
+    _, students, experiment_id = seed(2)
+    rows = [{'experiment_id': experiment_id, 'student_id': student_id, 'file_name': 'v1', 'file_path': 'v1'}
+            for student_id in students]
+    assert m.bulk_insert_submissions(rows, batch_size=1)
+    assert m.bulk_insert_submissions(rows, batch_size=1)
+    assert m.Submission.query.count() == 2
+
+    ids = {row.student_id: row.submission_id for row in m.Submission.query}
+    assert m.bulk_insert_submissions([{'experiment_id': experiment_id, 'student_id': students[0],
+                                       'file_name': 'v2', 'file_path': 'v2', 'status': 'received',
+                                       'archive_path': 'v2.zip'}])
+    m.db.session.expire_all()
+    row = m.Submission.query.filter_by(student_id=students[0]).one()
+    # 覆盖原记录（主键不变），并清空旧的解压令牌
+    assert (row.submission_id, row.file_name, row.status, row.archive_path) == (ids[students[0]], 'v2',
+                                                                                 'received', 'v2.zip')
+    assert row.extract_token is None
+    assert m.Submission.query.filter_by(student_id=students[1]).one().file_name == 'v1'
+
+
+def test_grade_upsert_is_idempotent(m, seed):
+    teacher_id, students, experiment_id = seed()
+    m.insert_submission(experiment_id, students[0], 'sub', 'sub')
+    submission_id = m.Submission.query.one().submission_id
+    assert m.insert_grade(submission_id, experiment_id, students[0], 60, teacher_id)
+    assert m.insert_grade(submission_id, experiment_id, students[0], 85.5, teacher_id)
+    m.db.session.expire_all()
+    assert [float(grade.score) for grade in m.Grade.query] == [85.5]
+
+
+def test_increment_columns_accumulate(m):
+    row = {'digest': 'a' * 64, 'size': 3, 'crc32': 1, 'ref_count': 1, 'created_at': datetime.utcnow()}
+    for _ in range(3):
+        assert m.bulk_write(m.Blob, [row], conflict_columns=['digest'], increment_columns=['ref_count'])
+    assert [(blob.digest, blob.ref_count) for blob in m.Blob.query] == [('a' * 64, 3)]
@@ -0,0 +1,66 @@
+"""评测缓存键与接口响应缓存的失效"""
+import os
+
+import pytest
+
+
+@pytest.fixture
+def student_dir(tmp_path):
+    folder = tmp_path / 'lab1' / 'testcode' / 'sub'
+    folder.mkdir(parents=True)
+    (folder / 'sub.py').write_text('print(1)\n')
+    (tmp_path / 'lab1' / 'testdata').mkdir()
+    (tmp_path / 'lab1' / 'testdata' / 'all_labels.csv').write_text('0\n1\n')
+    return folder
+
+
+def test_grading_cache_key_tracks_inputs(m, student_dir):
+    code = str(student_dir / 'sub.py')
+    key = m.compute_grading_cache_key(code)
+    assert m.compute_grading_cache_key(code) == key
+
+    # 评测产物和字节码不影响缓存键
+    (student_dir / 'all_preds.csv').write_text('1\n')
+    (student_dir / '__pycache__').mkdir()
+    (student_dir / '__pycache__' / 'sub.cpython-311.pyc').write_bytes(b'\0')
+    (student_dir / 'helper.pyc').write_bytes(b'\0')
+    assert m.compute_grading_cache_key(code) == key
+
+    assert m.compute_grading_cache_key(code, metric='mse') != key
+    (student_dir / 'model.txt').write_text('w')
+    with_model = m.compute_grading_cache_key(code)
+    assert with_model != key
+    (student_dir / 'sub.py').write_text('print(2)\n')
+    assert m.compute_grading_cache_key(code) != with_model
+    changed = m.compute_grading_cache_key(code)
+    (student_dir.parent.parent / 'testdata' / 'all_labels.csv').write_text('1\n1\n')
+    assert m.compute_grading_cache_key(code) != changed
+
+
+def test_submission_listing_skips_grading_outputs(m, student_dir):
+    (student_dir / 'all_preds.csv').write_text('1\n')
+    (student_dir / '__pycache__').mkdir()
+    (student_dir / '__pycache__' / 'sub.cpython-311.pyc').write_bytes(b'\0')
+    assert [relative for _, relative in m.walk_submission_files(str(student_dir))] == ['sub.py']
+
+
+def test_uploads_cache_invalidated_by_new_submission(m, seed):
+    _, students, experiment_id = seed(2)
+    client = m.app.test_client()
+    m.insert_submission(experiment_id, students[0], 'sub', 'sub0')
+    assert len(client.get(f'/api/experiments/{experiment_id}/uploads').get_json()['data']) == 1
+    hits = m.response_cache.hits
+    assert len(client.get(f'/api/experiments/{experiment_id}/uploads').get_json()['data']) == 1
+    assert m.response_cache.hits == hits + 1
+
+    m.insert_submission(experiment_id, students[1], 'sub', 'sub1')
+    assert len(client.get(f'/api/experiments/{experiment_id}/uploads').get_json()['data']) == 2
+
+
+def test_experiment_cache_invalidated_by_orm_edit(m, seed):
+    _, _, experiment_id = seed()
+    client = m.app.test_client()
+    assert client.get(f'/api/experiments/{experiment_id}').get_json()['title'] == '实验'
+    m.Experiment.query.get(experiment_id).experiment_name = '新名称'
+    m.db.session.commit()
+    assert client.get(f'/api/experiments/{experiment_id}').get_json()['title'] == '新名称'
@@ -0,0 +1,141 @@
+"""分块上传：创建会话、按偏移量续传、校验、过期清理"""
+import hashlib
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from conftest import make_zip
+
+
+@pytest.fixture
+def archive(tmp_path):
+    path = make_zip(tmp_path / 'src.zip', {'main/main.py': 'print(1)\n' * 200, 'main/data.txt': os.urandom(3000)})
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.fixture
+def client(m):
+    return m.app.test_client()
+
+
+def init_upload(client, experiment_id, student_id, size, name='main.zip'):
+    response = client.post('/api/experiments/upload/init', json={
+        'experimentId': experiment_id, 'studentId': student_id, 'fileName': name, 'fileSize': size})
+    return response
+
+
+def put_chunk(client, upload_id, offset, data):
+    return client.put(f'/api/experiments/upload/{upload_id}?offset={offset}', data=data)
+
+
+def test_upload_in_chunks_and_complete(m, seed, client, archive):
+    _, (student_id,), experiment_id = seed()
+    response = init_upload(client, experiment_id, student_id, len(archive))
+    assert response.status_code == 200
+    upload_id = response.get_json()['data']['upload_id']
+
+    for offset in range(0, len(archive), 1000):
+        response = put_chunk(client, upload_id, offset, archive[offset:offset + 1000])
+        assert response.get_json()['data']['offset'] == min(offset + 1000, len(archive))
+
+    response = client.post(f'/api/experiments/upload/{upload_id}/complete',
+                           json={'sha256': hashlib.sha256(archive).hexdigest()})
+    assert response.status_code == 200
+    submission = m.Submission.query.filter_by(experiment_id=experiment_id, student_id=student_id).one()
+    assert submission.status == 'received'
+    with open(submission.archive_path, 'rb') as f:
+        assert f.read() == archive
+    assert m.UploadSession.query.count() == 0
+    assert upload_id not in m._upload_hashers
+
+
+def test_resume_after_offset_mismatch(m, seed, client, archive):
+    _, (student_id,), experiment_id = seed()
+    upload_id = init_upload(client, experiment_id, student_id, len(archive)).get_json()['data']['upload_id']
+    put_chunk(client, upload_id, 0, archive[:1500])
+
+    # 客户端以为前一个分块丢失，重发了错误的偏移量
+    response = put_chunk(client, upload_id, 0, archive[:1500])
+    assert response.status_code == 409
+    assert response.get_json()['data']['offset'] == 1500
+
+    # 模拟进程重启：内存中的哈希丢失，从已写入的文件重新计算
+    m._upload_hashers.clear()
+    offset = client.get(f'/api/experiments/upload/{upload_id}').get_json()['data']['offset']
+    put_chunk(client, upload_id, offset, archive[offset:])
+    response = client.post(f'/api/experiments/upload/{upload_id}/complete',
+                           json={'sha256': hashlib.sha256(archive).hexdigest()})
+    assert response.status_code == 200
+
+
+def test_rejects_incomplete_oversized_and_corrupt_uploads(m, seed, client, archive):
+    _, (student_id,), experiment_id = seed()
+    upload_id = init_upload(client, experiment_id, student_id, len(archive)).get_json()['data']['upload_id']
+    put_chunk(client, upload_id, 0, archive[:100])
+    assert client.post(f'/api/experiments/upload/{upload_id}/complete').status_code == 400
+
+    assert put_chunk(client, upload_id, 100, archive[100:] + b'extra').status_code == 400
+    offset = client.get(f'/api/experiments/upload/{upload_id}').get_json()['data']['offset']
+    put_chunk(client, upload_id, offset, archive[offset:])
+
+    response = client.post(f'/api/experiments/upload/{upload_id}/complete', json={'sha256': '0' * 64})
+    assert response.status_code == 400
+    assert m.Submission.query.count() == 0
+    assert m.UploadSession.query.count() == 0
+    assert not [name for name in os.listdir(f'lab{experiment_id}/testcode') if name.startswith('.upload_')]
+
+
+def test_init_validates_submission(seed, client):
+    _, (student_id,), experiment_id = seed()
+    assert init_upload(client, experiment_id, student_id, 10, name='main.exe').status_code == 400
+    assert init_upload(client, experiment_id, student_id, None).status_code == 400
+
+
+def test_complete_rechecks_deadline(m, seed, client, archive):
+    _, (student_id,), experiment_id = seed()
+    upload_id = init_upload(client, experiment_id, student_id, len(archive)).get_json()['data']['upload_id']
+    put_chunk(client, upload_id, 0, archive)
+    m.Experiment.query.get(experiment_id).deadline = datetime.utcnow() - timedelta(minutes=1)
+    m.db.session.commit()
+
+    response = client.post(f'/api/experiments/upload/{upload_id}/complete')
+    assert response.status_code == 400
+    assert '截止时间' in response.get_json()['message']
+    assert m.Submission.query.count() == 0
+
+
+def expire(m, upload_id):
+    upload = m.UploadSession.query.get(upload_id)
+    upload.updated_at = datetime.utcnow() - timedelta(seconds=m.app.config['UPLOAD_SESSION_TTL'] + 60)
+    m.db.session.commit()
+    return upload.file_path
+
+
+def test_expired_session_is_gone(m, seed, client, archive):
+    _, (student_id,), experiment_id = seed()
+    upload_id = init_upload(client, experiment_id, student_id, len(archive)).get_json()['data']['upload_id']
+    put_chunk(client, upload_id, 0, archive[:100])
+    file_path = expire(m, upload_id)
+
+    assert client.get(f'/api/experiments/upload/{upload_id}').status_code == 410
+    assert put_chunk(client, upload_id, 100, archive[100:]).status_code == 410
+    assert not os.path.exists(file_path)
+    assert client.get(f'/api/experiments/upload/{upload_id}').status_code == 404
+
+
+def test_sweep_removes_expired_sessions_and_leftovers(m, seed, client, archive):
+    _, (student_id,), experiment_id = seed()
+    stale = init_upload(client, experiment_id, student_id, len(archive)).get_json()['data']['upload_id']
+    live = init_upload(client, experiment_id, student_id, len(archive)).get_json()['data']['upload_id']
+    stale_path = expire(m, stale)
+    orphan = os.path.join(f'lab{experiment_id}', 'testcode', '.upload_orphan_main.zip')
+    open(orphan, 'wb').close()
+    old = (datetime.utcnow() - timedelta(days=2)).timestamp()
+    os.utime(orphan, (old, old))
+
+    assert m.sweep_upload_sessions() == 1
+    assert not os.path.exists(stale_path) and not os.path.exists(orphan)
+    assert os.path.exists(m.UploadSession.query.get(live).file_path)
+    assert stale not in m._upload_hashers and live in m._upload_hashers
@@ -0,0 +1,97 @@
+"""首页统计预聚合：增量更新与数据库对账结果一致，误差指标不进入平均分"""
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def school(m, seed, monkeypatch):
+    """三个学生、一个准确率实验（已截止）和一个 mse 实验，返回 (教师ID, 学生ID, 准确率实验ID, mse实验ID)"""
+    monkeypatch.setattr(m, 'start_dashboard_reconciler', lambda: None)
+    teacher_id, students, accuracy = seed(3)
+    experiment = m.Experiment.query.get(accuracy)
+    experiment.deadline = datetime.utcnow() - timedelta(days=1)
+    regression = m.Experiment(experiment_name='回归', class_id=experiment.class_id, teacher_id=teacher_id,
+                              description='', metric='mse')
+    m.db.session.add(regression)
+    m.db.session.commit()
+    return teacher_id, students, accuracy, regression.experiment_id
+
+
+def submit(m, experiment_id, student_id, score=None, graded_by=None):
+    m.insert_submission(experiment_id, student_id, f's{student_id}', f's{student_id}')
+    if score is not None:
+        submission = m.Submission.query.filter_by(experiment_id=experiment_id, student_id=student_id).one()
+        m.insert_grade(submission.submission_id, experiment_id, student_id, score, graded_by)
+
+
+def fill(m, school):
+    teacher_id, (a, b, c), accuracy, regression = school
+    submit(m, accuracy, a, 90, teacher_id)
+    submit(m, accuracy, b, 70, teacher_id)
+    submit(m, accuracy, c)
+    submit(m, regression, a, 0.25, teacher_id)
+    submit(m, regression, b, 3.5, teacher_id)
+
+
+def test_teacher_stats(m, school):
+    fill(m, school)
+    teacher_id = school[0]
+    stats = m.dashboard_stats.teacher(teacher_id)
+    assert stats['submissionCount'] == 5
+    assert stats['gradedCount'] == 4
+    assert stats['pendingEvaluations'] == 1
+    # mse 成绩只计入已评分数
+    assert stats['averageScore'] == 80.0
+    assert (stats['maxScore'], stats['minScore'], stats['medianScore']) == (90.0, 70.0, 80.0)
+    assert (stats['totalExperiments'], stats['activeExperiments'], stats['completedExperiments']) == (2, 1, 1)
+    assert (stats['totalStudents'], stats['submittedStudents']) == (3, 3)
+    assert [klass['averageScore'] for klass in stats['classes']] == [80.0]
+
+
+def test_student_rank(m, school):
+    fill(m, school)
+    _, (a, b, c), _, _ = school
+    assert m.dashboard_stats.student(a)['currentRank'] == 1
+    stats = m.dashboard_stats.student(b)
+    assert (stats['currentRank'], stats['classSize'], stats['averageScore']) == (2, 2, 70.0)
+    stats = m.dashboard_stats.student(c)
+    assert (stats['currentRank'], stats['completedExperiments'], stats['totalExperiments']) == (0, 1, 2)
+
+
+def test_incremental_updates_match_reconcile(m, school):
+    teacher_id, (a, b, c), accuracy, regression = school
+    # 先构建一次，后续写入走增量更新
+    m.dashboard_stats.teacher(teacher_id)
+    fill(m, school)
+    submit(m, accuracy, a)  # 重新提交：保留原成绩并进入待评测
+    submit(m, accuracy, c, 100, teacher_id)
+    submit(m, regression, b, 1.5, teacher_id)
+    assert not m.dashboard_stats._stale
+    incremental = [m.dashboard_stats.teacher(teacher_id)] + [m.dashboard_stats.student(s) for s in (a, b, c)]
+    assert incremental[0]['pendingEvaluations'] == 1
+    assert incremental[3]['currentRank'] == 1
+
+    m.dashboard_stats.reconcile()
+    assert incremental == [m.dashboard_stats.teacher(teacher_id)] + [m.dashboard_stats.student(s) for s in (a, b, c)]
+
+
+def test_structure_change_triggers_rebuild(m, school):
+    teacher_id, _, accuracy, _ = school
+    assert m.dashboard_stats.teacher(teacher_id)['totalExperiments'] == 2
+    experiment = m.Experiment.query.get(accuracy)
+    m.db.session.add(m.Experiment(experiment_name='新实验', class_id=experiment.class_id, teacher_id=teacher_id,
+                                  description='', metric='accuracy'))
+    m.db.session.commit()
+    assert m.dashboard_stats.teacher(teacher_id)['totalExperiments'] == 3
+
+
+def test_endpoints(m, school):
+    fill(m, school)
+    teacher_id, (a, _, _), _, _ = school
+    client = m.app.test_client()
+    assert client.get('/api/teacher/dashboard/stats').status_code == 401
+    body = client.get('/api/teacher/dashboard/stats', headers={'User-ID': str(teacher_id)}).get_json()
+    assert body['data']['averageScore'] == 80.0
+    body = client.get('/api/student/dashboard/stats', headers={'User-ID': str(a)}).get_json()
+    assert body['data']['currentRank'] == 1
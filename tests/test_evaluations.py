@@ -0,0 +1,98 @@
+"""评价列表：单次投影查询，键集分页不重复不遗漏"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def submissions(m, seed):
+    """12 个提交，每 4 个共用同一提交时间，返回按列表顺序排列的提交ID"""
+    teacher_id, students, experiment_id = seed(12)
+    base = datetime(2024, 5, 1, 12, 0, 0)
+    for i, student_id in enumerate(students):
+        m.insert_submission(experiment_id, student_id, f's{student_id}', f'lab{experiment_id}/testcode/s{student_id}')
+        m.Submission.query.filter_by(student_id=student_id).update({'submit_time': base + timedelta(minutes=i // 4)})
+    first = m.Submission.query.order_by(m.Submission.submission_id).first()
+    m.db.session.add(m.Grade(submission_id=first.submission_id, student_id=first.student_id,
+                             experiment_id=experiment_id, score=88.5, graded_by=teacher_id))
+    m.db.session.commit()
+    rows = m.Submission.query.order_by(m.Submission.submit_time.desc(), m.Submission.submission_id.desc())
+    return experiment_id, [row.submission_id for row in rows]
+
+
+@pytest.fixture
+def statements(m):
+    executed = []
+
+    def record(conn, cursor, statement, *args):
+        executed.append(statement)
+
+    event.listen(m.db.engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(m.db.engine, 'before_cursor_execute', record)
+
+
+def test_cursor_pages_cover_every_row_once(m, submissions):
+    experiment_id, expected = submissions
+    client = m.app.test_client()
+    seen, cursor = [], None
+    while True:
+        params = {'experiment_id': experiment_id, 'limit': 5, 'with_total': 0}
+        if cursor:
+            params['cursor'] = cursor
+        data = client.get('/api/evaluations', query_string=params).get_json()['data']
+        assert data['total'] is None
+        seen.extend(item['id'] for item in data['list'])
+        cursor = data['next_cursor']
+        if not cursor:
+            break
+    assert seen == expected
+
+
+def test_new_submission_does_not_shift_cursor_pages(m, submissions, seed):
+    experiment_id, expected = submissions
+    client = m.app.test_client()
+    page = client.get('/api/evaluations', query_string={'experiment_id': experiment_id, 'limit': 6}).get_json()['data']
+    assert page['total'] == 12
+
+    # 翻页期间有新的提交，偏移量分页会重复返回上一页的最后一行
+    student = m.User(username='late', password='x', user_type=m.UserType.STUDENT, email='late@example.com',
+                     class_id=m.Class.query.one().class_id)
+    m.db.session.add(student)
+    m.db.session.commit()
+    m.insert_submission(experiment_id, student.user_id, 'late', 'late')
+
+    rest = client.get('/api/evaluations', query_string={
+        'experiment_id': experiment_id, 'limit': 6, 'cursor': page['next_cursor']}).get_json()['data']
+    assert [item['id'] for item in page['list'] + rest['list']] == expected
+    assert rest['next_cursor'] is None
+
+
+def test_rows_come_from_one_projected_query(m, submissions, statements):
+    experiment_id, expected = submissions
+    response = m.app.test_client().get('/api/evaluations', query_string={
+        'experiment_id': experiment_id, 'limit': 12, 'with_total': 0})
+    items = response.get_json()['data']['list']
+    assert len(items) == 12
+    assert len(statements) == 1
+    graded = [item for item in items if item['score'] is not None]
+    assert len(graded) == 1 and graded[0]['status'] == 3 and graded[0]['score'] == 88.5
+    assert {item['experiment_title'] for item in items} == {'实验'}
+    assert {item['class_name'] for item in items} == {'一班'}
+
+
+def test_status_filter_and_page_fallback(m, submissions):
+    experiment_id, expected = submissions
+    client = m.app.test_client()
+    data = client.get('/api/evaluations', query_string={
+        'experiment_id': experiment_id, 'status': 1, 'limit': 5, 'page': 3}).get_json()['data']
+    assert data['total'] == 11
+    assert [item['id'] for item in data['list']] == [i for i in expected if i != min(expected)][10:]
+
+
+def test_invalid_cursor(m, submissions):
+    experiment_id, _ = submissions
+    response = m.app.test_client().get('/api/evaluations', query_string={
+        'experiment_id': experiment_id, 'cursor': 'garbage'})
+    assert response.status_code == 400
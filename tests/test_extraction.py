@@ -0,0 +1,86 @@
+"""解压限制：压缩炸弹、目录穿越、绝对路径、符号链接，中止时清理已解压的内容"""
+import os
+import stat
+import zipfile
+
+import pytest
+
+from conftest import make_zip
+
+SMALL_LIMITS = {'max_total_bytes': 1024, 'max_files': 3, 'max_ratio': 200}
+
+
+def test_extracts_files_and_reports_stats(m, tmp_path):
+    archive = make_zip(tmp_path / 'ok.zip', {'sub/sub.py': 'print(1)\n', 'sub/data/a.txt': 'abc'})
+    stats = m.safe_extract_archive(archive, 'out')
+    assert stats['entries'] == 2
+    assert stats['bytes'] == len('print(1)\n') + 3
+    with open('out/sub/sub.py') as f:
+        assert f.read() == 'print(1)\n'
+
+
+def test_rejects_archive_over_total_size(m, tmp_path):
+    archive = make_zip(tmp_path / 'big.zip', {'sub/a.bin': b'x' * 600, 'sub/b.bin': b'y' * 600})
+    with pytest.raises(m.ArchiveLimitError):
+        m.safe_extract_archive(archive, 'out', limits=SMALL_LIMITS)
+    assert not os.path.exists('out/sub')
+
+
+def test_rejects_archive_with_too_many_files(m, tmp_path):
+    archive = make_zip(tmp_path / 'many.zip', {f'sub/{i}.txt': 'x' for i in range(5)})
+    with pytest.raises(m.ArchiveLimitError):
+        m.safe_extract_archive(archive, 'out', limits=SMALL_LIMITS)
+    assert not os.path.exists('out/sub')
+
+
+def test_rejects_zip_bomb_by_compression_ratio(m, tmp_path):
+    # 全零数据压缩比远超 200，超过 EXTRACT_RATIO_MIN_SIZE 后即中止
+    size = m.EXTRACT_RATIO_MIN_SIZE + 2 * m.EXTRACT_BUFFER_SIZE
+    archive = make_zip(tmp_path / 'bomb.zip', {'bomb.bin': b'\0' * size})
+    with pytest.raises(m.ArchiveLimitError):
+        m.safe_extract_archive(archive, 'out')
+    assert not os.path.exists('out/bomb.bin')
+
+
+@pytest.mark.parametrize('name', ['../evil.py', 'sub/../../evil.py', '..\\evil.py'])
+def test_rejects_path_traversal(m, tmp_path, name):
+    archive = make_zip(tmp_path / 'traversal.zip', {'sub/ok.py': 'x', name: 'x'})
+    with pytest.raises(m.ArchiveLimitError):
+        m.safe_extract_archive(archive, tmp_path / 'out')
+    assert not os.path.exists(tmp_path / 'evil.py')
+    assert not os.path.exists(tmp_path / 'out' / 'sub' / 'ok.py')
+
+
+@pytest.mark.parametrize('name', ['/tmp/evil.py', 'C:/evil.py'])
+def test_rejects_absolute_paths(m, tmp_path, name):
+    archive = make_zip(tmp_path / 'absolute.zip', {name: 'x'})
+    with pytest.raises(m.ArchiveLimitError):
+        m.safe_extract_archive(archive, 'out')
+
+
+def test_rejects_symlinks(m, tmp_path):
+    archive = str(tmp_path / 'link.zip')
+    with zipfile.ZipFile(archive, 'w') as zf:
+        info = zipfile.ZipInfo('sub/passwd')
+        info.external_attr = (stat.S_IFLNK | 0o777) << 16
+        zf.writestr(info, '/etc/passwd')
+    with pytest.raises(m.ArchiveLimitError):
+        m.safe_extract_archive(archive, 'out')
+    assert not os.path.lexists('out/sub/passwd')
+
+
+def test_blob_store_files_are_independent_copies(m, tmp_path):
+    """同一内容解压到两个提交目录后，改写其中一个不影响另一个和存储"""
+    first = make_zip(tmp_path / 'a.zip', {'sub/sub.py': 'print(1)\n'})
+    second = make_zip(tmp_path / 'b.zip', {'sub/sub.py': 'print(1)\n'})
+    stats = m.safe_extract_archive(first, 'one', blob_store=True)
+    m.register_submission_files(1, stats['files'])
+    assert m.safe_extract_archive(second, 'two', blob_store=True)['reused'] == 1
+
+    assert os.stat('one/sub/sub.py').st_nlink == 1
+    with open('one/sub/sub.py', 'w') as f:
+        f.write('hacked')
+    with open('two/sub/sub.py') as f:
+        assert f.read() == 'print(1)\n'
+    with open(m.blob_path(stats['files'][0][1])) as f:
+        assert f.read() == 'print(1)\n'
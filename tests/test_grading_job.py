@@ -0,0 +1,103 @@
+"""评测任务：条目进度逐条提交，成绩批量写入失败时条目状态不丢失"""
+import os
+
+import pytest
+from sqlalchemy import text
+
+
+@pytest.fixture
+def job(m, seed):
+    """三个学生各有一个可评测的提交，返回 (任务ID, {提交ID: 学生ID})"""
+    teacher_id, students, experiment_id = seed(3)
+    submissions = {}
+    for student_id in students:
+        folder = f'lab{experiment_id}/testcode/s{student_id}'
+        os.makedirs(folder)
+        with open(os.path.join(folder, f's{student_id}.py'), 'w') as f:
+            f.write(f'# {student_id}\n')
+        m.insert_submission(experiment_id, student_id, f's{student_id}', folder)
+    for row in m.Submission.query:
+        submissions[row.submission_id] = row.student_id
+    grading_job = m.GradingJob(experiment_id=experiment_id, status='running', total_count=len(submissions))
+    m.db.session.add(grading_job)
+    m.db.session.flush()
+    m.db.session.add_all([m.GradingJobItem(job_id=grading_job.job_id, submission_id=submission_id,
+                                           student_id=student_id) for submission_id, student_id in submissions.items()])
+    m.db.session.commit()
+    return grading_job.job_id, submissions
+
+
+def result(score, exit_reason='ok'):
+    return {'score': score, 'message': '', 'exit_reason': exit_reason, 'timings': {'user_code': 0.1}}
+
+
+def committed_statuses(m, job_id):
+    """用独立连接读取已提交的条目状态"""
+    with m.db.engine.connect() as connection:
+        rows = connection.execute(text('SELECT submission_id, status FROM grading_job_items WHERE job_id = :job_id'),
+                                  {'job_id': job_id})
+        return dict(rows.all())
+
+
+def test_item_progress_is_committed_per_result(m, job, monkeypatch):
+    job_id, submissions = job
+    ids = sorted(submissions)
+    seen = []
+
+    def fake_grade_submissions(tasks, metric='accuracy'):
+        for submission_id in ids:
+            # 取下一条结果时，之前的结果已对其他连接（进度接口）可见
+            seen.append(committed_statuses(m, job_id))
+            yield submission_id, result(50)
+
+    monkeypatch.setattr(m, 'grade_submissions', fake_grade_submissions)
+    m.run_grading_job(job_id)
+    assert seen[1][ids[0]] == 'success'
+    assert seen[2][ids[1]] == 'success'
+    assert set(committed_statuses(m, job_id).values()) == {'success'}
+    assert m.Grade.query.count() == 3
+
+
+def test_failed_grade_flush_keeps_other_item_statuses(m, job, monkeypatch):
+    job_id, submissions = job
+    ids = sorted(submissions)
+    real_bulk_write = m.bulk_write
+
+    def failing_bulk_write(model, rows, *args, **kwargs):
+        if model is m.Grade:
+            m.db.session.rollback()
+            return False
+        return real_bulk_write(model, rows, *args, **kwargs)
+
+    def fake_grade_submissions(tasks, metric='accuracy'):
+        yield ids[0], result(70)
+        # 进程池故障：没有沙箱运行信息
+        yield ids[1], {'score': 0, 'message': '工作进程崩溃'}
+        yield ids[2], result(0, exit_reason='timeout')
+
+    monkeypatch.setattr(m, 'bulk_write', failing_bulk_write)
+    monkeypatch.setattr(m, 'grade_submissions', fake_grade_submissions)
+    m.run_grading_job(job_id)
+
+    items = {item.submission_id: item for item in m.GradingJobItem.query.filter_by(job_id=job_id)}
+    assert {submission_id: item.status for submission_id, item in items.items()} == {
+        ids[0]: 'failed', ids[1]: 'failed', ids[2]: 'failed'}
+    assert items[ids[0]].message == '保存成绩失败'
+    assert items[ids[1]].message == '工作进程崩溃'
+    assert items[ids[2]].exit_reason == 'timeout'
+    # 评测缓存在成绩写入前已提交
+    assert m.GradingCache.query.count() == 2
+    assert m.Grade.query.count() == 0
+    assert m.GradingJob.query.get(job_id).status == 'done'
+
+
+def test_items_without_results_are_marked_failed(m, job, monkeypatch):
+    job_id, submissions = job
+    ids = sorted(submissions)
+
+    def fake_grade_submissions(tasks, metric='accuracy'):
+        yield ids[0], result(90)
+
+    monkeypatch.setattr(m, 'grade_submissions', fake_grade_submissions)
+    m.run_grading_job(job_id)
+    assert committed_statuses(m, job_id) == {ids[0]: 'success', ids[1]: 'failed', ids[2]: 'failed'}
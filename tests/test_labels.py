@@ -0,0 +1,68 @@
+"""真实标签加载：.npy 旁路文件、进程内缓存及失效"""
+import glob
+import os
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def clear_labels_cache(m):
+    m._labels_cache.clear()
+
+
+def write_labels(path, values):
+    with open(path, 'w') as f:
+        f.write('label\n' + ''.join(f'{value}\n' for value in values))
+
+
+def test_creates_memory_mapped_sidecar(m, tmp_path):
+    labels_file = tmp_path / 'all_labels.csv'
+    write_labels(labels_file, [3, 1, 2])
+    labels = m.load_labels(str(labels_file))
+    assert isinstance(labels, np.memmap)
+    assert labels.tolist() == [3, 1, 2]
+    assert os.path.exists(m._labels_sidecar_path(str(labels_file), os.stat(labels_file)))
+    assert m.load_labels(str(labels_file)) is labels
+
+
+def test_sidecar_reused_across_processes(m, tmp_path, monkeypatch):
+    labels_file = tmp_path / 'all_labels.csv'
+    write_labels(labels_file, [1, 2])
+    m.load_labels(str(labels_file))
+    m._labels_cache.clear()
+
+    # 模拟另一个评测进程：旁路文件已存在时不再解析CSV
+    def fail_read_csv(*args, **kwargs):
+        raise AssertionError('不应重新解析CSV')
+
+    monkeypatch.setattr(m.pd, 'read_csv', fail_read_csv)
+    assert m.load_labels(str(labels_file)).tolist() == [1, 2]
+
+
+def test_replaced_csv_gets_new_sidecar(m, tmp_path):
+    labels_file = tmp_path / 'all_labels.csv'
+    write_labels(labels_file, [1, 2])
+    first = m.load_labels(str(labels_file))
+    write_labels(labels_file, [5, 6, 7])
+    assert m.load_labels(str(labels_file)).tolist() == [5, 6, 7]
+    assert first.tolist() == [1, 2]
+    assert len(glob.glob(str(labels_file) + '.*.npy')) == 2
+
+
+def test_text_labels_are_fixed_width(m, tmp_path):
+    labels_file = tmp_path / 'all_labels.csv'
+    write_labels(labels_file, ['cat', 'horse'])
+    labels = m.load_labels(str(labels_file))
+    assert labels.dtype.kind == 'U'
+    assert labels.tolist() == ['cat', 'horse']
+
+
+def test_invalidate_removes_cache_and_sidecars(m):
+    labels_file = m.labels_file_for_experiment(7)
+    os.makedirs(os.path.dirname(labels_file))
+    write_labels(labels_file, [0, 1])
+    m.load_labels(labels_file)
+    m.invalidate_labels_cache(7)
+    assert m._labels_cache == {}
+    assert glob.glob(glob.escape(os.path.abspath(labels_file)) + '.*.npy') == []
@@ -0,0 +1,71 @@
+"""实验排行：名次计算、增量更新与重建一致、误差指标按成绩从低到高排"""
+import pytest
+
+
+def ranks(board, method='competition'):
+    return [(row['id'], row['rank']) for row in board.top(method=method)]
+
+
+def test_competition_and_dense_ranks(m):
+    board = m.ExperimentLeaderboard([(1, 90, 'a', 'c'), (2, 80, 'b', 'c'), (3, 90, 'c', 'c'), (4, 70, 'd', 'c')])
+    assert ranks(board) == [(1, 1), (3, 1), (2, 3), (4, 4)]
+    assert ranks(board, 'dense') == [(1, 1), (3, 1), (2, 2), (4, 3)]
+    assert board.rank(4) == 4 and board.rank(4, 'dense') == 3
+    assert board.rank(99) is None
+
+
+def test_incremental_updates_match_rebuild(m):
+    board = m.ExperimentLeaderboard([(1, 90, 'a', 'c'), (2, 80, 'b', 'c'), (3, 70, 'c', 'c')])
+    board.update(3, 95)
+    board.update(1, 80)
+    board.update(4, 60, 'd', 'c')
+    rebuilt = m.ExperimentLeaderboard([(1, 80, 'a', 'c'), (2, 80, 'b', 'c'), (3, 95, 'c', 'c'), (4, 60, 'd', 'c')])
+    assert ranks(board) == ranks(rebuilt) == [(3, 1), (1, 2), (2, 2), (4, 4)]
+    assert board.statistics() == rebuilt.statistics()
+    # 更新成绩时未给出姓名则沿用原有的
+    assert board.entry(1)['name'] == 'a'
+
+
+def test_lower_is_better_ranks_ascending(m):
+    board = m.ExperimentLeaderboard([(1, 0.5, 'a', 'c'), (2, 0.2, 'b', 'c'), (3, 0.9, 'c', 'c')],
+                                    higher_is_better=False)
+    assert ranks(board) == [(2, 1), (1, 2), (3, 3)]
+    board.update(3, 0.1)
+    assert ranks(board) == [(3, 1), (2, 2), (1, 3)]
+    statistics = board.statistics()
+    assert (statistics['max_score'], statistics['min_score']) == (0.5, 0.1)
+    assert (statistics['best_score'], statistics['worst_score']) == (0.1, 0.5)
+
+
+def grade(m, teacher_id, experiment_id, student_id, score):
+    m.insert_submission(experiment_id, student_id, 'sub', f'sub{student_id}')
+    submission_id = m.Submission.query.filter_by(experiment_id=experiment_id, student_id=student_id).one().submission_id
+    assert m.insert_grade(submission_id, experiment_id, student_id, score, teacher_id)
+
+
+@pytest.mark.parametrize('metric, expected', [('accuracy', [0, 2, 1]), ('mse', [1, 2, 0])])
+def test_registry_orders_by_experiment_metric(m, seed, metric, expected):
+    teacher_id, students, experiment_id = seed(3, metric=metric)
+    for student_id, score in zip(students, [90, 10, 50]):
+        grade(m, teacher_id, experiment_id, student_id, score)
+    top, me, statistics = m.leaderboards.ranking(experiment_id, students[1])
+    assert [row['id'] for row in top] == [students[i] for i in expected]
+    assert me['rank'] == expected.index(1) + 1
+    assert statistics['higher_is_better'] == (metric == 'accuracy')
+
+
+def test_registry_applies_new_grades_and_metric_changes(m, seed):
+    teacher_id, students, experiment_id = seed(2)
+    grade(m, teacher_id, experiment_id, students[0], 60)
+    grade(m, teacher_id, experiment_id, students[1], 70)
+    assert [row['id'] for row in m.leaderboards.ranking(experiment_id)[0]] == [students[1], students[0]]
+
+    # 已构建的排行随成绩写入增量更新
+    submission_id = m.Submission.query.filter_by(student_id=students[0]).one().submission_id
+    m.insert_grade(submission_id, experiment_id, students[0], 80, teacher_id)
+    assert [row['id'] for row in m.leaderboards.ranking(experiment_id)[0]] == [students[0], students[1]]
+
+    # 修改评测指标后排行方向随之改变
+    m.Experiment.query.get(experiment_id).metric = 'mae'
+    m.db.session.commit()
+    assert [row['id'] for row in m.leaderboards.ranking(experiment_id)[0]] == [students[1], students[0]]
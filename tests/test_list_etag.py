@@ -0,0 +1,65 @@
+"""教师实验列表和班级列表的条件请求：未变化时 304，同一秒内的修改也能返回新数据"""
+import pytest
+
+
+@pytest.fixture
+def teacher_headers(m, seed):
+    teacher_id, _, _ = seed()
+    return {'User-ID': str(teacher_id), 'User-Type': m.UserType.TEACHER.value}
+
+
+def get(m, url, headers, etag=None):
+    if etag:
+        headers = dict(headers, **{'If-None-Match': etag})
+    return m.app.test_client().get(url, headers=headers)
+
+
+@pytest.mark.parametrize('url, model, attribute, field', [
+    ('/api/teacher/experiments', 'Experiment', 'experiment_name', 'title'),
+    ('/api/classes', 'Class', 'class_name', 'name')
+])
+def test_rename_invalidates_etag(m, teacher_headers, url, model, attribute, field):
+    first = get(m, url, teacher_headers)
+    assert first.status_code == 200 and first.headers['ETag']
+    assert 'Last-Modified' not in first.headers
+    assert get(m, url, teacher_headers, first.headers['ETag']).status_code == 304
+
+    # 紧接着（同一秒内）改名，updated_at 不变也必须返回新数据
+    instance = getattr(m, model).query.one()
+    setattr(instance, attribute, '改名')
+    m.db.session.commit()
+    second = get(m, url, teacher_headers, first.headers['ETag'])
+    assert second.status_code == 200
+    assert second.get_json()['data'][0][field] == '改名'
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert get(m, url, teacher_headers, second.headers['ETag']).status_code == 304
+
+
+def test_insert_and_delete_invalidate_etag(m, seed, teacher_headers):
+    etag = get(m, '/api/classes', teacher_headers).headers['ETag']
+    klass = m.Class(class_name='二班', teacher_id=int(teacher_headers['User-ID']))
+    m.db.session.add(klass)
+    m.db.session.commit()
+    response = get(m, '/api/classes', teacher_headers, etag)
+    assert response.status_code == 200 and response.get_json()['total'] == 2
+
+    etag = response.headers['ETag']
+    m.db.session.delete(klass)
+    m.db.session.commit()
+    response = get(m, '/api/classes', teacher_headers, etag)
+    assert response.status_code == 200 and response.get_json()['total'] == 1
+
+
+def test_unrelated_writes_keep_etag(m, teacher_headers):
+    etag = get(m, '/api/teacher/experiments', teacher_headers).headers['ETag']
+    # 没有实际改动的实验对象、其他表的写入都不递增版本号
+    experiment = m.Experiment.query.one()
+    experiment.experiment_name = experiment.experiment_name
+    m.db.session.add(m.User(username='other', password='x', user_type=m.UserType.STUDENT, email='o@example.com'))
+    m.db.session.commit()
+    assert get(m, '/api/teacher/experiments', teacher_headers, etag).status_code == 304
+
+
+def test_etag_depends_on_query_parameters(m, teacher_headers):
+    etag = get(m, '/api/teacher/experiments', teacher_headers).headers['ETag']
+    assert get(m, '/api/teacher/experiments?limit=1', teacher_headers, etag).status_code == 200
@@ -0,0 +1,66 @@
+"""评测指标：分块计算结果与整体计算一致"""
+import pytest
+
+
+def write_csv(path, header, rows):
+    with open(path, 'w') as f:
+        f.write(header + '\n')
+        for row in rows:
+            f.write(','.join(str(value) for value in (row if isinstance(row, tuple) else (row,))) + '\n')
+    return str(path)
+
+
+@pytest.fixture
+def labels(tmp_path):
+    return write_csv(tmp_path / 'all_labels.csv', 'label', [0, 1, 2, 1, 0, 2, 1])
+
+
+@pytest.mark.parametrize('chunksize', [2, 3, 100])
+def test_accuracy_across_chunks(m, tmp_path, labels, chunksize):
+    preds = write_csv(tmp_path / 'all_preds.csv', 'pred', [0, 1, 1, 1, 0, 2, 0])
+    result = m.compute_metrics(preds, labels, chunksize=chunksize)
+    assert result['correct'] == 5
+    assert result['score'] == round(5 / 7 * 100, 2)
+    matrix = dict(zip(result['confusion_matrix']['labels'], result['confusion_matrix']['matrix']))
+    # 行为真实标签，列为预测
+    index = result['confusion_matrix']['labels']
+    assert matrix[1][index.index(0)] == 1 and matrix[2][index.index(1)] == 1
+
+
+def test_top_k(m, tmp_path, labels):
+    preds = write_csv(tmp_path / 'all_preds.csv', 'p1,p2', [(0, 1), (2, 1), (0, 1), (0, 2), (1, 0), (1, 0), (2, 0)])
+    assert m.compute_metrics(preds, labels, metric='top2', chunksize=3)['correct'] == 3
+    result = m.compute_metrics(preds, labels, metric='top3')
+    assert result['score'] == 0.0 and 'Top-3' in result['message']
+
+
+def test_macro_f1(m, tmp_path, labels):
+    preds = write_csv(tmp_path / 'all_preds.csv', 'pred', [0, 1, 1, 1, 0, 2, 0])
+    # 类别 0：P=2/3 R=1；类别 1：P=2/3 R=2/3；类别 2：P=1 R=1/2
+    expected = (0.8 + 2 / 3 + 2 / 3) / 3 * 100
+    assert m.compute_metrics(preds, labels, metric='macro_f1', chunksize=2)['metric_value'] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('metric, expected', [('mse', (0.25 + 1 + 4) / 3), ('mae', (0.5 + 1 + 2) / 3)])
+def test_regression_metrics(m, tmp_path, metric, expected):
+    labels = write_csv(tmp_path / 'all_labels.csv', 'y', [1.0, 2.0, 3.0])
+    preds = write_csv(tmp_path / 'all_preds.csv', 'y', [1.5, 1.0, 5.0])
+    result = m.compute_metrics(preds, labels, metric=metric, chunksize=2)
+    assert result['metric_value'] == pytest.approx(expected)
+    assert result['score'] == round(expected, 2)
+
+
+def test_prediction_count_mismatch(m, tmp_path, labels):
+    preds = write_csv(tmp_path / 'all_preds.csv', 'pred', [0] * 9)
+    result = m.compute_metrics(preds, labels, chunksize=2)
+    assert result['score'] == 0.0 and '(9)' in result['message'] and '(7)' in result['message']
+
+
+def test_unsupported_metric(m, tmp_path, labels):
+    assert m.compute_metrics(labels, labels, metric='auc')['message'] == '不支持的评测指标: auc'
+
+
+def test_text_labels(m, tmp_path):
+    labels = write_csv(tmp_path / 'all_labels.csv', 'label', ['cat', 'dog', 'cat'])
+    preds = write_csv(tmp_path / 'all_preds.csv', 'pred', ['cat', 'cat', 'cat'])
+    assert m.compute_metrics(preds, labels)['correct'] == 2
@@ -0,0 +1,77 @@
+"""/metrics：Prometheus 文本格式的请求、SQL 和评测指标"""
+
+
+def scrape(client):
+    """解析 /metrics 输出为 {样本名{标签}: 值}"""
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    samples = {}
+    for line in response.get_data(as_text=True).splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+def delta(before, after, name):
+    return after.get(name, 0.0) - before.get(name, 0.0)
+
+
+def test_registry_renders_prometheus_text(m):
+    registry = m.MetricsRegistry()
+    counter = registry.counter('jobs_total', '任务数', ('kind',))
+    histogram = registry.histogram('job_seconds', '任务耗时', (), (0.1, 1))
+    registry.collector(lambda: [('queue_depth', 'gauge', '队列长度', 3)])
+    counter.inc(kind='a"b')
+    counter.inc(2, kind='a"b')
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+    assert registry.render().splitlines() == [
+        '# HELP jobs_total 任务数',
+        '# TYPE jobs_total counter',
+        'jobs_total{kind="a\\"b"} 3.0',
+        '# HELP job_seconds 任务耗时',
+        '# TYPE job_seconds histogram',
+        'job_seconds_bucket{le="0.1"} 1.0',
+        'job_seconds_bucket{le="1.0"} 2.0',
+        'job_seconds_bucket{le="+Inf"} 3.0',
+        'job_seconds_sum 5.55',
+        'job_seconds_count 3.0',
+        '# HELP queue_depth 队列长度',
+        '# TYPE queue_depth gauge',
+        'queue_depth 3.0',
+    ]
+
+
+def test_requests_and_sql_are_counted(m, seed):
+    _, (student_id,), _ = seed()
+    client = m.app.test_client()
+    route = 'method="GET",route="/api/student/experiments"'
+    before = scrape(client)
+    for _ in range(2):
+        assert client.get('/api/student/experiments', headers={'User-ID': str(student_id)}).status_code == 200
+    assert client.get('/api/student/experiments').status_code == 401
+    after = scrape(client)
+
+    assert delta(before, after, 'http_requests_total{%s,status="200"}' % route) == 2
+    assert delta(before, after, 'http_requests_total{%s,status="401"}' % route) == 1
+    assert delta(before, after, 'http_request_duration_seconds_count{%s}' % route) == 3
+    # 每个请求的SQL语句数：列表、总数和已提交实验各一条，未登录请求不查询
+    assert delta(before, after, 'http_request_db_queries_sum{%s}' % route) == 6
+    assert delta(before, after, 'http_request_db_queries_bucket{%s,le="0.0"}' % route) == 1
+    assert delta(before, after, 'db_queries_total{statement="SELECT"}') >= 6
+    assert 'response_cache_hits_total' in after
+
+
+def test_grading_runs_are_recorded(m):
+    client = m.app.test_client()
+    before = scrape(client)
+    m.record_grading_run({'exit_reason': 'timeout', 'timings': {'fork': 0.002, 'user_code': 3.0}})
+    m.record_grading_run({})
+    after = scrape(client)
+    assert delta(before, after, 'grading_runs_total{exit_reason="timeout"}') == 1
+    assert delta(before, after, 'grading_runs_total{exit_reason="unknown"}') == 1
+    assert delta(before, after, 'grading_stage_seconds_bucket{stage="fork",le="0.005"}') == 1
+    assert delta(before, after, 'grading_stage_seconds_sum{stage="user_code"}') == 3.0
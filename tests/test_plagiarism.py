@@ -0,0 +1,143 @@
+"""代码查重：归一化分词、MinHash 相似度估计、LSH 候选对"""
+import os
+import random
+
+import numpy as np
+import pytest
+
+ORIGINAL = '''
+import numpy as np
+
+
+def load(path):
+    # 读取数据
+    rows = []
+    with open(path) as f:
+        for line in f:
+            rows.append([float(x) for x in line.split(',')])
+    return np.array(rows)
+
+
+def evaluate_model():
+    data = load('data.csv')
+    weights = np.linalg.lstsq(data[:, :-1], data[:, -1], rcond=None)[0]
+    preds = data[:, :-1] @ weights
+    with open('all_preds.csv', 'w') as f:
+        f.write('pred\\n')
+        for value in preds:
+            f.write(f'{value}\\n')
+'''
+
+# 改名、改注释、改字符串后的抄袭版本
+RENAMED = '''
+import numpy as np
+
+
+def read_table(filename):
+    table = []
+    with open(filename) as handle:
+        for row in handle:
+            table.append([float(v) for v in row.split(',')])  # 每行一个样本
+    return np.array(table)
+
+
+def evaluate_model():
+    matrix = read_table('train.csv')
+    coef = np.linalg.lstsq(matrix[:, :-1], matrix[:, -1], rcond=None)[0]
+    output = matrix[:, :-1] @ coef
+    with open('all_preds.csv', 'w') as out:
+        out.write('label\\n')
+        for item in output:
+            out.write(f'{item}\\n')
+'''
+
+UNRELATED = '''
+class Net:
+    def __init__(self, layers):
+        self.layers = layers
+
+    def forward(self, x):
+        for layer in self.layers:
+            x = layer(x)
+        return x
+
+
+if __name__ == '__main__':
+    net = Net([abs, round])
+    print(net.forward(-2.6))
+    while True:
+        try:
+            break
+        except KeyError:
+            pass
+'''
+
+
+def test_renaming_does_not_change_tokens(m):
+    assert m.normalize_python_tokens(ORIGINAL) == m.normalize_python_tokens(RENAMED)
+    assert m.normalize_python_tokens(ORIGINAL) != m.normalize_python_tokens(UNRELATED)
+    # 无法分词的源码按正则切分
+    assert m.normalize_python_tokens('print "a" # x\n  )') == ['print', 'STR', ')']
+
+
+def test_minhash_estimates_jaccard(m):
+    rng = random.Random(1)
+    tokens = [f't{rng.randrange(1000)}' for _ in range(2000)]
+    changed = tokens[:1500] + [f'u{rng.randrange(1000)}' for _ in range(500)]
+    left, right = m.minhash_signature(tokens, shingle_size=1), m.minhash_signature(changed, shingle_size=1)
+    exact = len(set(tokens) & set(changed)) / len(set(tokens) | set(changed))
+    estimate = m.signature_similarity(left.astype('<u4').tobytes(), right.astype('<u4').tobytes())
+    assert abs(estimate - exact) < 0.15
+    assert np.array_equal(m.minhash_signature(tokens), m.minhash_signature(list(tokens)))
+    assert len(m.lsh_band_hashes(left)) == m.app.config['PLAGIARISM_LSH_BANDS']
+
+
+@pytest.fixture
+def plagiarism(m, seed):
+    teacher_id, students, experiment_id = seed(4)
+    for student_id, source in zip(students, [ORIGINAL, RENAMED, UNRELATED, None]):
+        folder = f'lab{experiment_id}/testcode/s{student_id}'
+        os.makedirs(os.path.join(folder, 'pkg'))
+        if source:
+            with open(os.path.join(folder, 'pkg', 'main.py'), 'w') as f:
+                f.write(source)
+        m.insert_submission(experiment_id, student_id, f's{student_id}', folder)
+    ids = {row.student_id: row.submission_id for row in m.Submission.query}
+    return experiment_id, [ids[student_id] for student_id in students], students
+
+
+def check(m, **body):
+    response = m.app.test_client().post('/api/teacher/experiment/check-plagiarism', json=body)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_flags_only_the_copied_pair(m, plagiarism):
+    experiment_id, (original, renamed, unrelated, empty), students = plagiarism
+    body = check(m, experiment_id=experiment_id)
+    results = {item['submission_id']: item for item in body['data']['results']}
+    assert results[original]['similar_with_id'] == students[1]
+    assert results[renamed]['similar_with_name'] == '学生0'
+    assert results[original]['highest_similarity'] == 100.0
+    assert results[unrelated]['similar_with_id'] is None
+    assert results[empty]['status'] == 'error'
+    assert m.candidate_pairs(experiment_id) == {(original, renamed)}
+
+
+def test_single_submission_uses_index(m, plagiarism, monkeypatch):
+    experiment_id, (original, renamed, unrelated, _), students = plagiarism
+    check(m, experiment_id=experiment_id)
+    # 签名已是最新，不再重新读取代码
+    monkeypatch.setattr(m, 'submission_code_tokens', lambda folder: pytest.fail('不应重新计算签名'))
+    body = check(m, experiment_id=experiment_id, submission_id=renamed)
+    assert [item['similar_with_id'] for item in body['data']['results']] == [students[0]]
+    assert m.candidate_pairs(experiment_id, unrelated) == set()
+
+
+def test_rejects_bad_requests(m, plagiarism):
+    experiment_id, *_ = plagiarism
+    client = m.app.test_client()
+    assert client.post('/api/teacher/experiment/check-plagiarism', json={}).status_code == 400
+    assert client.post('/api/teacher/experiment/check-plagiarism', json={'experiment_id': 99}).status_code == 404
+    assert client.post('/api/teacher/experiment/check-plagiarism',
+                       json={'experiment_id': experiment_id, 'submission_id': 999}).status_code == 404
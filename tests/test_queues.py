@@ -0,0 +1,118 @@
+"""解压队列与评测队列：领取、解压期间重新提交、进程中断后重新排队"""
+import io
+import os
+from datetime import datetime, timedelta
+
+from conftest import make_zip
+
+
+def upload(m, tmp_path, experiment_id, student_id, content):
+    archive = make_zip(tmp_path / 'upload.zip', {'sub/sub.py': content})
+    with open(archive, 'rb') as f:
+        response = m.app.test_client().post('/api/experiments/upload', data={
+            'file': (io.BytesIO(f.read()), 'sub.zip'),
+            'experimentId': str(experiment_id),
+            'studentId': str(student_id)
+        }, content_type='multipart/form-data')
+    assert response.status_code == 200, response.get_json()
+
+
+def submission(m):
+    row = m.Submission.query.one()
+    m.db.session.refresh(row)
+    return row
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_claim_and_extract(m, seed, tmp_path):
+    _, students, experiment_id = seed()
+    upload(m, tmp_path, experiment_id, students[0], 'v1')
+    submission_id, token = m._claim_extraction()
+    assert m._claim_extraction() is None
+    m.extract_submission(submission_id, token)
+
+    row = submission(m)
+    assert (row.status, row.archive_path, row.extract_token, row.file_count) == ('ready', None, None, 1)
+    assert read(f'lab{experiment_id}/testcode/sub/sub.py') == 'v1'
+    assert m.SubmissionFile.query.count() == 1
+
+
+def test_reupload_during_extraction_discards_stale_result(m, seed, tmp_path):
+    _, students, experiment_id = seed()
+    upload(m, tmp_path, experiment_id, students[0], 'v1')
+    stale_claim = m._claim_extraction()
+    upload(m, tmp_path, experiment_id, students[0], 'v2')
+
+    # 旧的解压完成时令牌已失效：不写状态、不移入文件，新的压缩包仍等待解压
+    m.extract_submission(*stale_claim)
+    row = submission(m)
+    assert row.status == 'received' and os.path.exists(row.archive_path)
+    assert not os.path.exists(f'lab{experiment_id}/testcode/sub')
+    assert not [name for name in os.listdir(f'lab{experiment_id}/testcode') if name.startswith('.extract_')]
+
+    m.extract_submission(*m._claim_extraction())
+    assert submission(m).status == 'ready'
+    assert read(f'lab{experiment_id}/testcode/sub/sub.py') == 'v2'
+    assert m.SubmissionFile.query.count() == 1
+
+
+def test_stale_extraction_is_requeued(m, seed, tmp_path):
+    _, students, experiment_id = seed()
+    upload(m, tmp_path, experiment_id, students[0], 'v1')
+    submission_id, token = m._claim_extraction()
+    temp_folder = m._extraction_temp_folder(experiment_id, token)
+    os.makedirs(temp_folder)
+
+    # 心跳仍新鲜时不回收
+    assert m.requeue_stale_extractions() == []
+    m.Submission.query.update({'extract_heartbeat_at': datetime.utcnow() - timedelta(hours=1)})
+    m.db.session.commit()
+    assert m.requeue_stale_extractions() == [submission_id]
+    assert m.requeue_stale_extractions() == []
+    row = submission(m)
+    assert (row.status, row.extract_token) == ('received', None)
+    assert os.path.exists(row.archive_path)
+    assert not os.path.exists(temp_folder)
+
+    # 中断的进程稍后写回结果时被丢弃，压缩包保留给重新领取的解压
+    m.extract_submission(submission_id, token)
+    assert submission(m).status == 'received'
+    m.extract_submission(*m._claim_extraction())
+    assert submission(m).status == 'ready'
+
+
+def test_stale_grading_job_is_requeued(m, seed):
+    teacher_id, students, experiment_id = seed(2)
+    submissions = []
+    for student_id in students:
+        row = m.Submission(experiment_id=experiment_id, student_id=student_id, file_name='sub', file_path='sub')
+        m.db.session.add(row)
+        m.db.session.flush()
+        submissions.append(row.submission_id)
+    old = datetime.utcnow() - timedelta(hours=1)
+    stale = m.GradingJob(experiment_id=experiment_id, status='running', started_at=old, heartbeat_at=old,
+                         total_count=2)
+    alive = m.GradingJob(experiment_id=experiment_id, status='running', started_at=datetime.utcnow(),
+                         heartbeat_at=datetime.utcnow(), total_count=0)
+    m.db.session.add_all([stale, alive])
+    m.db.session.flush()
+    m.db.session.add_all([
+        m.GradingJobItem(job_id=stale.job_id, submission_id=submissions[0], student_id=students[0], status='running'),
+        m.GradingJobItem(job_id=stale.job_id, submission_id=submissions[1], student_id=students[1],
+                         status='success', score=80)
+    ])
+    m.db.session.commit()
+
+    assert m.requeue_stale_grading_jobs() == [stale.job_id]
+    assert m.requeue_stale_grading_jobs() == []
+    m.db.session.expire_all()
+    assert stale.status == 'queued' and alive.status == 'running'
+    # 已完成的条目保留，中断时正在评测的条目重新排队
+    statuses = {item.submission_id: item.status for item in m.GradingJobItem.query.filter_by(job_id=stale.job_id)}
+    assert statuses == {submissions[0]: 'queued', submissions[1]: 'success'}
+    assert m._claim_grading_job() == stale.job_id
+    assert m._claim_grading_job() is None
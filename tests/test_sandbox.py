@@ -0,0 +1,94 @@
+"""沙箱评测：资源限制与退出原因"""
+import os
+import textwrap
+
+import pytest
+
+
+@pytest.fixture
+def lab(tmp_path):
+    """按评测目录结构准备 lab1/testdata 真实标签，返回写学生代码的函数"""
+    testdata = tmp_path / 'lab1' / 'testdata'
+    testdata.mkdir(parents=True)
+    (testdata / 'all_labels.csv').write_text('label\n0\n1\n1\n')
+
+    def write_code(source):
+        student_dir = tmp_path / 'lab1' / 'testcode' / 'student1'
+        student_dir.mkdir(parents=True, exist_ok=True)
+        path = student_dir / 'main.py'
+        path.write_text(textwrap.dedent(source))
+        return str(path)
+
+    return write_code
+
+
+GOOD_CODE = """
+    print('training done')
+    with open('all_preds.csv', 'w') as f:
+        f.write('pred\\n0\\n1\\n0\\n')
+"""
+
+
+def test_ok(m, lab):
+    result = m.run_sandboxed(lab(GOOD_CODE), wall_seconds=60)
+    assert result['exit_reason'] == 'ok' and result['exit_code'] == 0
+    assert result['score'] == round(2 / 3 * 100, 2)
+    assert 'training done' in result['stdout']
+    assert result['cacheable'] is True
+    assert result['peak_rss_kb'] and result['cpu_time'] is not None
+    assert {'fork', 'import', 'user_code', 'scoring'} <= set(result['timings'])
+
+
+def test_wall_clock_timeout(m, lab):
+    result = m.run_sandboxed(lab('import time\ntime.sleep(60)\n'), wall_seconds=3)
+    assert result['exit_reason'] == 'timeout'
+    assert result['score'] == 0.0 and result['cacheable'] is False
+    assert result['runtime'] < 30
+
+
+@pytest.mark.skipif(not hasattr(os, 'wait4'), reason='需要 RLIMIT_CPU')
+def test_cpu_limit(m, lab):
+    result = m.run_sandboxed(lab('while True:\n    pass\n'), cpu_seconds=3, wall_seconds=60)
+    assert result['exit_reason'] == 'cpu_limit'
+    assert 'CPU时间超过限制' in result['message']
+
+
+def test_killed_by_signal(m, lab):
+    result = m.run_sandboxed(lab('import os, signal\nos.kill(os.getpid(), signal.SIGKILL)\n'), wall_seconds=60)
+    assert result['exit_reason'] == 'killed'
+    assert result['exit_code'] < 0 and result['score'] == 0.0
+
+
+def test_output_is_bounded(m, lab):
+    result = m.run_sandboxed(lab("print('x' * 100000)\n" + textwrap.dedent(GOOD_CODE)), wall_seconds=60,
+                             output_limit=1000)
+    assert result['exit_reason'] == 'ok'
+    assert len(result['stdout']) == 1000 and result['output_truncated'] is True
+
+
+@pytest.fixture
+def warm_pool(m, monkeypatch):
+    monkeypatch.setitem(m.app.config, 'GRADING_WORKERS', 1)
+    monkeypatch.setitem(m.app.config, 'GRADING_PRELOAD_MODULES', ['numpy', 'pandas'])
+    monkeypatch.setitem(m.app.config, 'GRADING_WARM_POOL', True)
+    monkeypatch.setattr(m, '_grading_pool', None)
+    yield
+    if m._grading_pool is not None:
+        m._grading_pool.shutdown()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='预热进程池需要 fork')
+def test_warm_pool_forks_from_template(m, lab, warm_pool, tmp_path):
+    good = lab('import numpy, pandas\n' + textwrap.dedent(GOOD_CODE))
+    killed_dir = tmp_path / 'lab1' / 'testcode' / 'student2'
+    killed_dir.mkdir()
+    killed = killed_dir / 'main.py'
+    killed.write_text('import os, signal\nos.kill(os.getpid(), signal.SIGKILL)\n')
+
+    results = dict(m.grade_submissions([(1, good), (2, str(killed))]))
+    assert m.get_grading_pool() is m._grading_pool
+    assert results[1]['exit_reason'] == 'ok' and results[1]['score'] == round(2 / 3 * 100, 2)
+    assert results[2]['exit_reason'] == 'killed'
+    # 沙箱由预热进程直接 fork：不重新启动解释器，预加载的模块导入几乎不耗时
+    assert results[1]['timings']['fork'] < 0.5
+    assert results[1]['timings']['import'] < 0.05
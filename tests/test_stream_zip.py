@@ -0,0 +1,51 @@
+"""流式打包下载：输出为完整有效的zip，不包含评测产物"""
+import io
+import os
+import zipfile
+
+
+def test_stream_zip_is_valid(m, tmp_path):
+    large = os.urandom(3 * m.EXTRACT_BUFFER_SIZE + 17)
+    (tmp_path / 'large.bin').write_bytes(large)
+    (tmp_path / 'small.py').write_text('print(1)\n')
+
+    chunks = list(m.stream_zip([(str(tmp_path / 'large.bin'), 'a/large.bin'),
+                                (str(tmp_path / 'missing.txt'), 'a/missing.txt'),
+                                (str(tmp_path / 'small.py'), 'a/b/small.py')]))
+    # 边压缩边输出，而不是最后一次性产出整个压缩包
+    assert len([chunk for chunk in chunks if chunk]) > 2
+    with zipfile.ZipFile(io.BytesIO(b''.join(chunks))) as bundle:
+        assert bundle.testzip() is None
+        assert bundle.namelist() == ['a/large.bin', 'a/b/small.py']
+        assert bundle.read('a/large.bin') == large
+        assert bundle.read('a/b/small.py') == b'print(1)\n'
+
+
+def test_download_excludes_grading_artifacts(m, seed):
+    _, students, experiment_id = seed(2)
+    for student_id in students:
+        folder = f'lab{experiment_id}/testcode/s{student_id}'
+        os.makedirs(os.path.join(folder, '__pycache__'))
+        with open(os.path.join(folder, 'main.py'), 'w') as f:
+            f.write(f'# {student_id}\n')
+        for artifact in ('all_preds.csv', '__pycache__/main.cpython-311.pyc'):
+            with open(os.path.join(folder, artifact), 'w') as f:
+                f.write('x')
+        m.insert_submission(experiment_id, student_id, f's{student_id}', folder)
+    # 尚未解压完成的提交不打包
+    m.Submission.query.filter_by(student_id=students[1]).update({'status': 'extracting'})
+    m.db.session.commit()
+
+    response = m.app.test_client().get(f'/api/experiments/{experiment_id}/submissions/download')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/zip'
+    with zipfile.ZipFile(io.BytesIO(response.get_data())) as bundle:
+        assert bundle.testzip() is None
+        assert bundle.namelist() == [f'{students[0]}_s{students[0]}/main.py']
+
+
+def test_download_without_submissions(m, seed):
+    _, _, experiment_id = seed()
+    client = m.app.test_client()
+    assert client.get(f'/api/experiments/{experiment_id}/submissions/download').status_code == 404
+    assert client.get('/api/experiments/999/submissions/download').status_code == 404
@@ -0,0 +1,76 @@
+"""学生实验列表：键集分页与关键词搜索"""
+from datetime import datetime, timedelta
+
+import pytest
+
+
+@pytest.fixture
+def experiments(m, seed):
+    """再创建 9 个实验（每 3 个共用同一发布时间），返回 (学生ID, 按列表顺序排列的实验ID)"""
+    teacher_id, (student_id,), first = seed()
+    class_id = m.Experiment.query.get(first).class_id
+    base = datetime(2024, 3, 1, 8, 0, 0)
+    names = ['图像分类', '文本分类', '房价回归'] * 3
+    for i, name in enumerate(names):
+        m.db.session.add(m.Experiment(experiment_name=f'{name}{i}', class_id=class_id, teacher_id=teacher_id,
+                                      description='卷积网络' if name == '图像分类' else '', metric='accuracy',
+                                      publish_time=base + timedelta(days=i // 3)))
+    m.Experiment.query.get(first).publish_time = base - timedelta(days=1)
+    m.db.session.commit()
+    m.insert_submission(first + 2, student_id, 'sub', 'sub')
+    rows = m.Experiment.query.order_by(m.Experiment.publish_time.desc(), m.Experiment.experiment_id.desc())
+    return student_id, [row.experiment_id for row in rows]
+
+
+def fetch(m, student_id, **params):
+    response = m.app.test_client().get('/api/student/experiments', query_string=params,
+                                       headers={'User-ID': str(student_id)})
+    return response.get_json()
+
+
+def walk(m, student_id, **params):
+    ids, cursor = [], None
+    while True:
+        body = fetch(m, student_id, limit=4, with_total=0, **params, **({'cursor': cursor} if cursor else {}))
+        assert body['total'] is None
+        ids.extend(item['id'] for item in body['data'])
+        cursor = body['next_cursor']
+        if not cursor:
+            return ids, body
+
+
+def test_cursor_pages_cover_every_experiment_once(m, experiments):
+    student_id, expected = experiments
+    ids, _ = walk(m, student_id)
+    assert ids == expected
+
+
+def test_page_fallback_and_total(m, experiments):
+    student_id, expected = experiments
+    body = fetch(m, student_id, page=2, limit=4)
+    assert body['total'] == 10
+    assert [item['id'] for item in body['data']] == expected[4:8]
+
+
+def test_submitted_flag(m, experiments):
+    student_id, expected = experiments
+    items = fetch(m, student_id, limit=20)['data']
+    assert [item['id'] for item in items if item['submitted']] == [min(expected) + 2]
+
+
+def test_keyword_searches_name_and_description(m, experiments):
+    student_id, _ = experiments
+    names = {item['title'] for item in fetch(m, student_id, keyword='分类', limit=20)['data']}
+    assert names == {f'{name}{i}' for i, name in enumerate(['图像分类', '文本分类', '房价回归'] * 3) if '分类' in name}
+    # 每个空格分隔的词都必须出现
+    ids, _ = walk(m, student_id, keyword='卷积 图像')
+    assert len(ids) == 3
+    assert fetch(m, student_id, keyword='卷积 文本')['total'] == 0
+
+
+def test_requires_login_and_valid_cursor(m, experiments):
+    student_id, _ = experiments
+    assert m.app.test_client().get('/api/student/experiments').status_code == 401
+    response = m.app.test_client().get('/api/student/experiments', query_string={'cursor': '2024|x'},
+                                       headers={'User-ID': str(student_id)})
+    assert response.status_code == 400